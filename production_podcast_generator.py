@@ -455,7 +455,9 @@ class PodcastGenerator:
         timestamp = int(time.time())
         podcast_info_path = os.path.join(self.output_dir, f"podcast_{timestamp}.txt")
         
-        with open(podcast_info_path, "w") as f:
+        # Write to a temp name and rename atomically so directory scans never
+        # pick up a half-written info file
+        with open(podcast_info_path + ".tmp", "w") as f:
             f.write(f"PODCAST: {title}\n")
             f.write(f"Generated: {time.ctime()}\n")
             f.write(f"Style: {podcast_style}\n")
@@ -472,7 +474,33 @@ class PodcastGenerator:
             
             if final_podcast:
                 f.write(f"\nFULL PODCAST AUDIO: {os.path.basename(final_podcast)}\n")
-        
+
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(podcast_info_path + ".tmp", podcast_info_path)
+
+        # Machine-readable sidecar so the web interface can load the podcast
+        # info with a single json.load instead of re-parsing the text file
+        podcast_json_path = os.path.join(self.output_dir, f"podcast_{timestamp}.json")
+        with open(podcast_json_path + ".tmp", "w") as f:
+            json.dump({
+                "title": title,
+                "date": time.ctime(),
+                "style": podcast_style,
+                "voice": voice_style,
+                "background_music": add_background_music,
+                "intro": intro_text,
+                "outro": outro_text,
+                "key_points": [
+                    {"title": segment['title'], "text": segment['text']}
+                    for segment in podcast_segments
+                ],
+                "audio_file": os.path.basename(final_podcast) if final_podcast else None
+            }, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(podcast_json_path + ".tmp", podcast_json_path)
+
         print("\n" + "=" * 60)
         print(f"Podcast generation complete!")
         print(f"Podcast information saved to: {podcast_info_path}")
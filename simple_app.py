@@ -16,9 +16,16 @@ os.makedirs("uploads", exist_ok=True)
 os.makedirs("output_podcasts", exist_ok=True)
 os.makedirs("temp_audio", exist_ok=True)
 
+# On Windows 10+ an empty os.system call enables ANSI escape processing
+# for the console, so clear_screen can avoid spawning a subprocess
+if os.name == 'nt':
+    os.system('')
+
 def clear_screen():
     """Clear the console screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # Write the ANSI clear sequence directly instead of forking cls/clear
+    sys.stdout.write('\x1b[2J\x1b[H')
+    sys.stdout.flush()
 
 def print_header():
     """Print application header"""
@@ -37,40 +44,34 @@ def print_menu():
     print()
     return input("Select an option (1-4): ")
 
-def simulate_processing(filename):
-    """Simulate audio processing"""
-    print(f"Processing file: {filename}")
-    print()
-    
-    # Create progress bar
-    for i in range(101):
-        sys.stdout.write('\r')
-        sys.stdout.write("[%-50s] %d%%" % ('='*int(i/2), i))
-        sys.stdout.flush()
-        time.sleep(0.05)
-    
-    print("\n\nProcessing complete!")
-    
-    # Create sample output files
+def _process_one(filename):
+    """Write the simulated podcast segments and metadata for one recording"""
     output_dir = "output_podcasts"
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    now_iso = now.isoformat()  # One timestamp shared by all segments in this batch
+
+    # Include the recording's stem in the output names: parallel batch workers
+    # share the seconds-resolution timestamp, so it alone can't keep files
+    # from different recordings apart
+    stem = os.path.splitext(os.path.basename(filename))[0]
+
     # Create 2 sample podcast segments
     for i in range(2):
         # Create a simple text file as a placeholder for audio
-        podcast_filename = f"podcast_segment_{i+1}_{timestamp}.txt"
+        podcast_filename = f"podcast_segment_{i+1}_{stem}_{timestamp}.txt"
         podcast_path = os.path.join(output_dir, podcast_filename)
-        
+
         with open(podcast_path, 'w') as f:
             f.write(f"This is a simulated podcast segment {i+1} created from {filename}\n")
             f.write(f"In a real implementation, this would be an audio file.\n")
-        
+
         # Create metadata file
         metadata = {
             "title": f"Segment {i+1} - Key Discussion Point",
             "description": "This is a simulated podcast segment for demonstration purposes.",
             "meeting_title": os.path.splitext(filename)[0],
-            "created_at": datetime.now().isoformat(),
+            "created_at": now_iso,
             "duration_sec": 120,
             "key_points": [
                 "This is a key point from the meeting",
@@ -78,14 +79,40 @@ def simulate_processing(filename):
                 "Final conclusion from this segment"
             ]
         }
-        
+
         metadata_path = os.path.splitext(podcast_path)[0] + '.json'
         with open(metadata_path, 'w') as f:
             json.dump(metadata, f, indent=2)
-    
-    print(f"Created 2 podcast segments in {output_dir}")
+
+def simulate_processing(filename):
+    """Simulate audio processing"""
+    print(f"Processing file: {filename}")
+    print()
+
+    # Create progress bar
+    for i in range(101):
+        sys.stdout.write('\r')
+        sys.stdout.write("[%-50s] %d%%" % ('='*int(i/2), i))
+        sys.stdout.flush()
+        time.sleep(0.05)
+
+    print("\n\nProcessing complete!")
+
+    _process_one(filename)
+
+    print("Created 2 podcast segments in output_podcasts")
     input("\nPress Enter to continue...")
 
+def simulate_processing_batch(filenames):
+    """Process multiple recordings in parallel across CPU cores"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor() as executor:
+        # chunksize batches dispatch so IPC overhead is amortized
+        list(executor.map(_process_one, filenames, chunksize=4))
+
+    print(f"Created podcast segments for {len(filenames)} recordings in output_podcasts")
+
 def upload_recording():
     """Upload and process a meeting recording"""
     print_header()
@@ -132,29 +159,35 @@ def view_podcasts():
     output_dir = "output_podcasts"
     
     if os.path.exists(output_dir):
-        for filename in os.listdir(output_dir):
-            if filename.endswith('.json'):
-                # Read metadata
-                metadata_path = os.path.join(output_dir, filename)
-                try:
-                    with open(metadata_path, 'r') as f:
-                        metadata = json.load(f)
-                    
-                    # Get corresponding audio file
-                    audio_file = os.path.splitext(filename)[0] + '.txt'  # In real app, this would be .mp3 or .wav
-                    
-                    if os.path.exists(os.path.join(output_dir, audio_file)):
-                        podcasts.append({
-                            'filename': audio_file,
-                            'path': os.path.join(output_dir, audio_file),
-                            'title': metadata.get('title', filename),
-                            'description': metadata.get('description', ''),
-                            'created_at': metadata.get('created_at', ''),
-                            'duration_sec': metadata.get('duration_sec', 0),
-                            'key_points': metadata.get('key_points', []),
-                        })
-                except:
-                    pass
+        # Bucket directory entries by stem in one scandir pass so pairing
+        # metadata with audio doesn't need a stat call per file
+        entries = {}
+        with os.scandir(output_dir) as it:
+            for entry in it:
+                if entry.is_file():
+                    stem, ext = os.path.splitext(entry.name)
+                    entries.setdefault(stem, {})[ext] = entry.path
+
+        for stem, files in entries.items():
+            # In real app, the audio file would be .mp3 or .wav
+            if '.json' not in files or '.txt' not in files:
+                continue
+
+            try:
+                with open(files['.json'], 'r') as f:
+                    metadata = json.load(f)
+
+                podcasts.append({
+                    'filename': stem + '.txt',
+                    'path': files['.txt'],
+                    'title': metadata.get('title', stem + '.json'),
+                    'description': metadata.get('description', ''),
+                    'created_at': metadata.get('created_at', ''),
+                    'duration_sec': metadata.get('duration_sec', 0),
+                    'key_points': metadata.get('key_points', []),
+                })
+            except:
+                pass
     
     # Sort podcasts by creation date (newest first)
     podcasts.sort(key=lambda x: x.get('created_at', ''), reverse=True)
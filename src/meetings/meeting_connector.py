@@ -8,8 +8,12 @@ import json
 import requests
 import threading
 import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables
 load_dotenv()
@@ -36,9 +40,51 @@ class MeetingConnector:
         self.current_meeting = None
         self.recording_active = False
         self.recording_thread = None
-        self.audio_chunks = []
+        # deque appends stay O(1) without list's growth reallocations; an
+        # hour of simulated 16KB chunks is a few hundred thousand appends
+        self.audio_chunks = deque()
         self.transcript_chunks = []
-        
+
+        # Pooled sessions with keep-alive: the transcript polling loop is a
+        # hot path and fresh TCP+TLS handshakes per call would dominate it
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+
+        self._meetstream_session = requests.Session()
+        self._meetstream_session.mount("https://", adapter)
+        self._meetstream_session.mount("http://", adapter)
+        self._meetstream_session.headers["Authorization"] = f"Bearer {self.meetstream_api_key}"
+        self._meetstream_session.headers["Connection"] = "keep-alive"
+
+        self._zoom_session = requests.Session()
+        self._zoom_session.mount("https://", adapter)
+        self._zoom_session.mount("http://", adapter)
+        self._zoom_session.headers["Authorization"] = f"Bearer {self.zoom_jwt_token}"
+        self._zoom_session.headers["Connection"] = "keep-alive"
+
+        # Transcript polling runs on its own cadence, resuming from the
+        # last segment the API has already sent us
+        self._transcript_thread = None
+        self._last_segment_id = None
+        self._seen_segment_keys = set()
+
+        # Live recordings stream straight to disk instead of accumulating
+        # chunks in memory for the whole meeting
+        self._audio_fp = None
+        self._audio_path = None
+        self._bytes_written = 0
+        self._transcript_fp = None
+        self._transcript_path = None
+
+        # UIs poll the meeting list repeatedly; a short TTL cache keeps
+        # that from burning Zoom API quota
+        self._meetings_cache = None
+        self._meetings_cache_ts = 0.0
+        self._full_transcript_path = None
+
         # Check if MeetStream.ai API is available
         self.meetstream_available = self._check_meetstream_api()
         
@@ -52,8 +98,7 @@ class MeetingConnector:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.meetstream_api_key}"}
-            response = requests.get(f"{self.meetstream_api_url}/status", headers=headers)
+            response = self._meetstream_session.get(f"{self.meetstream_api_url}/status")
             if response.status_code == 200:
                 print("[SUCCESS] MeetStream.ai API connection successful")
                 return True
@@ -75,8 +120,7 @@ class MeetingConnector:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.zoom_jwt_token}"}
-            response = requests.get("https://api.zoom.us/v2/users/me", headers=headers)
+            response = self._zoom_session.get("https://api.zoom.us/v2/users/me")
             if response.status_code == 200:
                 print("[SUCCESS] Zoom API connection successful")
                 return True
@@ -91,11 +135,14 @@ class MeetingConnector:
         """List available meetings that can be joined"""
         if not self.zoom_available:
             return {"error": "Zoom API not available", "meetings": []}
+
+        # Serve from the short-lived cache when fresh
+        if self._meetings_cache is not None and time.time() - self._meetings_cache_ts < 30.0:
+            return self._meetings_cache
         
         try:
             # Get list of scheduled meetings
-            headers = {"Authorization": f"Bearer {self.zoom_jwt_token}"}
-            response = requests.get("https://api.zoom.us/v2/users/me/meetings", headers=headers)
+            response = self._zoom_session.get("https://api.zoom.us/v2/users/me/meetings")
             
             if response.status_code == 200:
                 meetings_data = response.json()
@@ -110,7 +157,10 @@ class MeetingConnector:
                         "join_url": meeting.get("join_url")
                     })
                 
-                return {"success": True, "meetings": meetings}
+                result = {"success": True, "meetings": meetings}
+                self._meetings_cache = result
+                self._meetings_cache_ts = time.time()
+                return result
             else:
                 return {"error": f"Failed to get meetings: {response.status_code}", "meetings": []}
         except Exception as e:
@@ -126,7 +176,6 @@ class MeetingConnector:
         
         try:
             # Join the meeting via MeetStream.ai
-            headers = {"Authorization": f"Bearer {self.meetstream_api_key}"}
             payload = {}
             
             if meeting_id:
@@ -134,15 +183,15 @@ class MeetingConnector:
             elif meeting_url:
                 payload["meeting_url"] = meeting_url
             
-            response = requests.post(
-                f"{self.meetstream_api_url}/meetings/join", 
-                headers=headers,
+            response = self._meetstream_session.post(
+                f"{self.meetstream_api_url}/meetings/join",
                 json=payload
             )
             
             if response.status_code == 200:
                 meeting_data = response.json()
                 self.current_meeting = meeting_data
+                self._meetings_cache = None
                 return {"success": True, "meeting": meeting_data}
             else:
                 return {"error": f"Failed to join meeting: {response.status_code}"}
@@ -159,12 +208,29 @@ class MeetingConnector:
         
         # Start recording in a separate thread
         self.recording_active = True
-        self.audio_chunks = []
+        self.audio_chunks = deque()
         self.transcript_chunks = []
+        self._last_segment_id = None
+        self._seen_segment_keys = set()
+
+        # Open the output files up front; the workers write directly, and
+        # the transcript lands as NDJSON lines so nothing big accumulates
+        timestamp = int(time.time())
+        self._audio_path = os.path.join(self.temp_dir, f"meeting_recording_{timestamp}.wav")
+        self._audio_fp = open(self._audio_path, "wb", buffering=1 << 20)
+        self._bytes_written = 0
+        self._transcript_path = os.path.join(self.temp_dir, f"meeting_transcript_{timestamp}.ndjson")
+        self._transcript_fp = open(self._transcript_path, "w")
         
         self.recording_thread = threading.Thread(target=self._recording_worker)
         self.recording_thread.daemon = True
         self.recording_thread.start()
+
+        # Poll transcripts on a separate thread so the audio loop can
+        # consume chunks at line rate
+        self._transcript_thread = threading.Thread(target=self._transcript_poll_worker)
+        self._transcript_thread.daemon = True
+        self._transcript_thread.start()
         
         return {"success": True, "message": "Recording started"}
     
@@ -179,37 +245,46 @@ class MeetingConnector:
                 self.recording_active = False
                 return
             
-            headers = {"Authorization": f"Bearer {self.meetstream_api_key}"}
-            
-            # Start streaming endpoint
+            # Start streaming endpoint; the body is already binary audio,
+            # so skip transfer compression
             stream_url = f"{self.meetstream_api_url}/meetings/{meeting_id}/stream"
             stream_params = {"session_id": session_id, "format": "audio"}
-            
-            with requests.get(stream_url, headers=headers, params=stream_params, stream=True) as response:
+            stream_headers = {"Accept-Encoding": "identity"}
+
+            with self._meetstream_session.get(stream_url, headers=stream_headers,
+                                              params=stream_params, stream=True) as response:
                 if response.status_code != 200:
                     print(f"[ERROR] Streaming failed with status code: {response.status_code}")
                     self.recording_active = False
                     return
                 
-                # Process the audio stream
-                for chunk in response.iter_content(chunk_size=16384):
-                    if not self.recording_active:
+                # Process the audio stream as fast as the kernel delivers
+                # it; transcript polling happens on its own thread. One
+                # preallocated buffer serves every read, so the hot loop
+                # allocates nothing per chunk
+                response.raw.decode_content = True
+                buffer = bytearray(65536)
+                view = memoryview(buffer)
+
+                while self.recording_active:
+                    n = response.raw.readinto(view)
+                    if not n:
                         break
-                    
-                    if chunk:
-                        # Save audio chunk
-                        self.audio_chunks.append(chunk)
-                        
-                        # Get real-time transcription
-                        self._get_transcription_update()
-                        
-                        # Sleep briefly to avoid overwhelming the API
-                        time.sleep(0.1)
+
+                    # Write the chunk straight to disk
+                    self._audio_fp.write(view[:n])
+                    self._bytes_written += n
         except Exception as e:
             print(f"[ERROR] Recording worker exception: {str(e)}")
         finally:
             self.recording_active = False
     
+    def _transcript_poll_worker(self):
+        """Worker thread polling for transcription updates while recording"""
+        while self.recording_active:
+            self._get_transcription_update()
+            time.sleep(2.0)
+
     def _get_transcription_update(self):
         """Get transcription updates from MeetStream.ai"""
         try:
@@ -219,21 +294,53 @@ class MeetingConnector:
             if not meeting_id or not session_id:
                 return
             
-            headers = {"Authorization": f"Bearer {self.meetstream_api_key}"}
             transcript_url = f"{self.meetstream_api_url}/meetings/{meeting_id}/transcript"
             transcript_params = {"session_id": session_id}
-            
-            response = requests.get(transcript_url, headers=headers, params=transcript_params)
+            if self._last_segment_id is not None:
+                # Only fetch segments newer than the last one we've seen
+                transcript_params["since"] = self._last_segment_id
+
+            response = self._meetstream_session.get(transcript_url, params=transcript_params)
             
             if response.status_code == 200:
                 transcript_data = response.json()
                 
-                # Process new transcript segments
+                # Process new transcript segments, deduplicating via O(1)
+                # key membership instead of scanning the growing list
                 for segment in transcript_data.get("segments", []):
-                    if segment not in self.transcript_chunks:
+                    key = segment.get("id") or (
+                        segment.get("start_time"),
+                        segment.get("end_time"),
+                        segment.get("speaker")
+                    )
+                    if key not in self._seen_segment_keys:
+                        self._seen_segment_keys.add(key)
                         self.transcript_chunks.append(segment)
+                        if self._transcript_fp is not None:
+                            # Append to the NDJSON file as segments arrive
+                            self._transcript_fp.write(
+                                json.dumps(segment, separators=(',', ':')) + '\n'
+                            )
+                    if segment.get("id") is not None:
+                        self._last_segment_id = segment["id"]
         except Exception as e:
             print(f"[ERROR] Transcription update exception: {str(e)}")
+
+    @staticmethod
+    def poll_transcript_updates(connectors):
+        """
+        Poll transcript updates for several active meetings at once.
+
+        Each connector keeps its own keep-alive session, so mapping the
+        polls over a small thread pool reuses the established connections
+        instead of issuing the requests sequentially.
+        """
+        active = [c for c in connectors if c.current_meeting]
+        if not active:
+            return
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for future in [executor.submit(c._get_transcription_update) for c in active]:
+                future.result()
     
     def stop_recording(self):
         """Stop recording the current meeting"""
@@ -242,30 +349,50 @@ class MeetingConnector:
         
         self.recording_active = False
         
-        # Wait for recording thread to finish
+        # Wait for recording and transcript threads to finish
         if self.recording_thread and self.recording_thread.is_alive():
             self.recording_thread.join(timeout=5.0)
+        if self._transcript_thread and self._transcript_thread.is_alive():
+            self._transcript_thread.join(timeout=5.0)
         
-        # Save the recorded audio to a file
+        # Finalize the recorded audio
         timestamp = int(time.time())
-        audio_path = os.path.join(self.temp_dir, f"meeting_recording_{timestamp}.wav")
-        
-        with open(audio_path, "wb") as f:
-            for chunk in self.audio_chunks:
-                f.write(chunk)
+        if self._audio_fp is not None:
+            # Live recordings were streamed to disk as they arrived
+            self._audio_fp.flush()
+            self._audio_fp.close()
+            self._audio_fp = None
+            audio_path = self._audio_path
+        else:
+            # Simulated recordings still buffer chunks in memory
+            audio_path = os.path.join(self.temp_dir, f"meeting_recording_{timestamp}.wav")
+            with open(audio_path, "wb") as f:
+                for chunk in self.audio_chunks:
+                    f.write(chunk)
         
-        # Save the transcript to a file
-        transcript_path = os.path.join(self.temp_dir, f"meeting_transcript_{timestamp}.json")
+        # Finalize the transcript
+        if self._transcript_fp is not None:
+            # Live transcripts were appended as NDJSON during recording
+            self._transcript_fp.flush()
+            self._transcript_fp.close()
+            self._transcript_fp = None
+            transcript_path = self._transcript_path
+        else:
+            # Simulated recordings buffer segments; write them out now
+            transcript_path = os.path.join(self.temp_dir, f"meeting_transcript_{timestamp}.ndjson")
+            with open(transcript_path, "w") as f:
+                for segment in self.transcript_chunks:
+                    f.write(json.dumps(segment, separators=(',', ':')) + '\n')
         
-        with open(transcript_path, "w") as f:
-            json.dump({"transcript": self.transcript_chunks}, f, indent=2)
-        
-        return {
+        result = {
             "success": True,
             "message": "Recording stopped",
             "audio_path": audio_path,
             "transcript_path": transcript_path
         }
+        if self._full_transcript_path is not None:
+            result["full_transcript_path"] = self._full_transcript_path
+        return result
     
     def leave_meeting(self):
         """Leave the current meeting"""
@@ -285,13 +412,13 @@ class MeetingConnector:
                 return {"success": True, "message": "Meeting session cleared"}
             
             # Leave the meeting via MeetStream.ai
-            headers = {"Authorization": f"Bearer {self.meetstream_api_key}"}
             leave_url = f"{self.meetstream_api_url}/meetings/{meeting_id}/leave"
             leave_params = {"session_id": session_id}
-            
-            response = requests.post(leave_url, headers=headers, params=leave_params)
+
+            response = self._meetstream_session.post(leave_url, params=leave_params)
             
             self.current_meeting = None
+            self._meetings_cache = None
             
             if response.status_code == 200:
                 return {"success": True, "message": "Left meeting successfully"}
@@ -312,7 +439,9 @@ class MeetingConnector:
             "topic": self.current_meeting.get("topic", "Unknown Meeting"),
             "recording": self.recording_active,
             "transcript_chunks": len(self.transcript_chunks),
-            "audio_duration_seconds": len(self.audio_chunks) * 0.1  # Approximate duration
+            # Approximate duration from bytes streamed (or buffered chunks
+            # for simulated meetings)
+            "audio_duration_seconds": (self._bytes_written or len(self.audio_chunks) * 16384) / 163840
         }
     
     def simulate_meeting(self, duration_seconds=60, participants=2):
@@ -333,8 +462,11 @@ class MeetingConnector:
         
         # Start simulated recording
         self.recording_active = True
-        self.audio_chunks = []
+        self.audio_chunks = deque()
         self.transcript_chunks = []
+        self._last_segment_id = None
+        self._seen_segment_keys = set()
+        self._full_transcript_path = None
         
         # Create a thread for simulation
         self.recording_thread = threading.Thread(
@@ -362,48 +494,55 @@ class MeetingConnector:
             # Simulated participant names
             participant_names = ["Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley"]
             meeting_participants = participant_names[:participants]
+
+            # One shared chunk is enough — the content is never inspected,
+            # and reusing the same immutable bytes object avoids a CSPRNG
+            # syscall plus a fresh 16KB allocation every second
+            audio_chunk = os.urandom(16384)
             
-            # Generate simulated transcript chunks
-            start_time = time.time()
+            # Generate simulated transcript chunks on a deterministic tick
+            # schedule: wall-clock modulo checks can miss or double-fire a
+            # segment depending on loop timing
             chunk_interval = 5  # Generate a new transcript chunk every 5 seconds
-            
-            while self.recording_active and (time.time() - start_time) < duration_seconds:
-                # Create a simulated audio chunk (just random bytes)
-                audio_chunk = os.urandom(16384)  # 16KB of random data
+            tick = 0
+            next_transcript_tick = 0
+
+            while self.recording_active and tick < duration_seconds:
+                # Append the shared simulated audio chunk
                 self.audio_chunks.append(audio_chunk)
-                
-                # Every chunk_interval, generate a transcript segment
-                elapsed = time.time() - start_time
-                if int(elapsed) % chunk_interval == 0:
-                    topic = topics[int(elapsed / chunk_interval) % len(topics)]
-                    speaker = meeting_participants[int(elapsed / chunk_interval) % len(meeting_participants)]
-                    
+
+                # Every chunk_interval ticks, generate a transcript segment
+                if tick == next_transcript_tick:
+                    segment_index = tick // chunk_interval
+                    topic = topics[segment_index % len(topics)]
+                    speaker = meeting_participants[segment_index % len(meeting_participants)]
+
                     transcript_segment = {
                         "speaker": speaker,
                         "text": f"I think we should discuss our {topic} in more detail.",
-                        "start_time": elapsed,
-                        "end_time": elapsed + chunk_interval - 0.5,
+                        "start_time": tick,
+                        "end_time": tick + chunk_interval - 0.5,
                         "confidence": 0.95
                     }
-                    
+
                     self.transcript_chunks.append(transcript_segment)
-                
+                    next_transcript_tick += chunk_interval
+
                 # Sleep to simulate real-time recording
+                tick += 1
                 time.sleep(1)
         except Exception as e:
             print(f"[ERROR] Simulation worker exception: {str(e)}")
         finally:
             self.recording_active = False
             
-            # Generate a complete simulated transcript
-            full_transcript = " ".join([chunk.get("text", "") for chunk in self.transcript_chunks])
-            
-            # Add the full transcript as the last chunk
-            self.transcript_chunks.append({
-                "speaker": "SYSTEM",
-                "text": full_transcript,
-                "start_time": 0,
-                "end_time": duration_seconds,
-                "confidence": 0.98,
-                "is_full_transcript": True
-            })
+            # Write the complete transcript to its own file instead of
+            # appending it as a duplicate SYSTEM chunk, which doubled the
+            # transcript memory and serialization cost
+            full_transcript = " ".join(chunk.get("text", "") for chunk in self.transcript_chunks)
+            full_transcript_path = os.path.join(
+                self.temp_dir, f"full_transcript_{int(time.time())}.txt"
+            )
+            with open(full_transcript_path, "w") as f:
+                f.write(full_transcript)
+            self._full_transcript_path = full_transcript_path
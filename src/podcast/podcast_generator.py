@@ -3,18 +3,33 @@ Podcast generation from meeting recordings
 """
 
 import os
+import re
 import json
+import time
+import shutil
+import hashlib
 import logging
 import tempfile
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from src.transcription.assembly_client import AssemblyClient
 from src.audio.ffmpeg_processor import FFmpegProcessor
+from src.podcast.podcast_index import PodcastIndex
 from src.tts.voice_generator import VoiceGenerator
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundary pattern compiled once; both transcript analysis and
+# key-point extraction split on it per call
+_SENT_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Filename sanitizer: one C-level pass, collapsing runs of unsafe
+# characters into a single underscore
+_SAFE_TITLE = re.compile(r'[^A-Za-z0-9]+')
+
 class PodcastGenerator:
     """Generate podcast snippets from meeting recordings"""
     
@@ -35,7 +50,58 @@ class PodcastGenerator:
         
         self.output_dir = output_dir or os.getenv("OUTPUT_DIR", "./output_podcasts")
         os.makedirs(self.output_dir, exist_ok=True)
-    
+
+        # Transcripts and segment analyses are cached on disk keyed by
+        # audio content, so re-processing the same recording skips the
+        # AssemblyAI call entirely
+        self._cache_dir = os.path.join(self.output_dir, ".cache")
+        os.makedirs(self._cache_dir, exist_ok=True)
+        self._cache_ttl_sec = 7 * 24 * 3600
+
+        # Listing UIs read this index with one query instead of opening
+        # every JSON sidecar on each render
+        self._index = PodcastIndex(self.output_dir)
+
+    @staticmethod
+    def _content_key(audio_path: str) -> str:
+        """
+        Compute a cache key from the audio content
+
+        The first MB plus the file size is enough to distinguish meeting
+        recordings without hashing hours of audio.
+
+        Args:
+            audio_path: Path to the audio file
+
+        Returns:
+            Hex digest key
+        """
+        hasher = hashlib.sha256()
+        with open(audio_path, 'rb') as f:
+            hasher.update(f.read(1 << 20))
+        hasher.update(str(os.path.getsize(audio_path)).encode())
+        return hasher.hexdigest()
+
+    def _cache_load(self, key: str, kind: str):
+        """Load a cached artifact if present and fresh, else None"""
+        cache_path = os.path.join(self._cache_dir, f"{key}.{kind}.json")
+        try:
+            if time.time() - os.path.getmtime(cache_path) < self._cache_ttl_sec:
+                with open(cache_path, 'r') as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _cache_store(self, key: str, kind: str, value) -> None:
+        """Write an artifact to the on-disk cache"""
+        cache_path = os.path.join(self._cache_dir, f"{key}.{kind}.json")
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump(value, f)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {cache_path}: {str(e)}")
+
     def generate_from_file(self, audio_path: str, meeting_title: Optional[str] = None,
                          use_voice_narration: bool = True) -> List[str]:
         """
@@ -57,32 +123,43 @@ class PodcastGenerator:
         
         # Step 1: Convert audio to WAV if needed
         wav_path = self.ffmpeg_processor.convert_to_wav(audio_path)
+
+        cache_key = self._content_key(audio_path)
+
+        # Step 2: Transcribe audio (cached by content)
+        transcript = self._cache_load(cache_key, 'transcript')
+        if transcript is None:
+            logger.info("Transcribing audio...")
+            transcript = self.assembly_client.transcribe_audio(wav_path)
+            self._cache_store(cache_key, 'transcript', transcript)
+        else:
+            logger.info("Using cached transcript")
+
+        # Step 3: Analyze transcript to identify key segments (cached)
+        segments = self._cache_load(cache_key, 'segments')
+        if segments is None:
+            logger.info("Analyzing transcript for key segments...")
+            segments = self.analyze_transcript(transcript)
+            self._cache_store(cache_key, 'segments', segments)
+        else:
+            logger.info("Using cached segment analysis")
         
-        # Step 2: Transcribe audio
-        logger.info("Transcribing audio...")
-        transcript = self.assembly_client.transcribe_audio(wav_path)
-        
-        # Step 3: Analyze transcript to identify key segments
-        logger.info("Analyzing transcript for key segments...")
-        segments = self.analyze_transcript(transcript)
-        
-        # Step 4: Process each segment
-        podcast_paths = []
-        
-        for i, segment in enumerate(segments):
-            logger.info(f"Processing segment {i+1}/{len(segments)}: {segment.get('title')}")
-            
-            # Extract segment from audio
-            segment_path = self._process_segment(
-                wav_path, 
-                segment, 
-                meeting_title,
-                use_voice_narration,
-                i
-            )
-            
-            podcast_paths.append(segment_path)
-        
+        # Step 4: Process segments in parallel; each one is dominated by
+        # ffmpeg subprocesses and TTS network calls, so threads scale well
+        with ThreadPoolExecutor(max_workers=min(8, len(segments))) as executor:
+            futures = [
+                executor.submit(
+                    self._process_segment,
+                    wav_path,
+                    segment,
+                    meeting_title,
+                    use_voice_narration,
+                    i
+                )
+                for i, segment in enumerate(segments)
+            ]
+            podcast_paths = [future.result() for future in futures]
+
         logger.info(f"Generated {len(podcast_paths)} podcast segments")
         return podcast_paths
     
@@ -101,33 +178,37 @@ class PodcastGenerator:
             # This is a simplified implementation
             # In a real implementation, you would use more sophisticated analysis
             
-            # Split transcript into paragraphs
-            paragraphs = [p for p in transcript.split('\n\n') if p.strip()]
+            # Split transcript into paragraphs; filter drops blanks without
+            # a second comprehension pass
+            paragraphs = list(filter(str.strip, transcript.split('\n\n')))
             
             # If too few paragraphs, split by sentences
             if len(paragraphs) < 3:
-                import re
-                paragraphs = re.split(r'(?<=[.!?])\s+', transcript)
+                paragraphs = _SENT_SPLIT.split(transcript)
             
             # Calculate approximate timestamps (assuming 150 words per minute)
-            words = transcript.split()
-            total_words = len(words)
+            # One cumulative sum over per-paragraph word counts gives every
+            # segment's word offsets in O(1) instead of recounting slices
+            word_counts = np.fromiter(
+                (len(p.split()) for p in paragraphs),
+                dtype=np.int32, count=len(paragraphs)
+            )
+            cum_words = np.concatenate(([0], np.cumsum(word_counts)))
+            total_words = max(int(cum_words[-1]), 1)
             total_duration = total_words / 150 * 60  # in seconds
-            
+
             # Create segments
             segments = []
-            words_so_far = 0
-            
+
             for i, paragraph in enumerate(paragraphs):
                 if i % 3 == 0 and i < len(paragraphs) - 1:  # Create a segment every 3 paragraphs
                     # Calculate start and end times
-                    para_words = sum(len(p.split()) for p in paragraphs[i:min(i+3, len(paragraphs))])
-                    start_time = words_so_far / total_words * total_duration
-                    end_time = (words_so_far + para_words) / total_words * total_duration
-                    words_so_far += para_words
-                    
+                    end_index = min(i + 3, len(paragraphs))
+                    start_time = int(cum_words[i]) / total_words * total_duration
+                    end_time = int(cum_words[end_index]) / total_words * total_duration
+
                     # Create segment
-                    segment_text = ' '.join(paragraphs[i:min(i+3, len(paragraphs))])
+                    segment_text = ' '.join(paragraphs[i:end_index])
                     segments.append({
                         'title': f"Segment {i//3 + 1}",
                         'description': segment_text[:100] + "...",
@@ -177,19 +258,16 @@ class PodcastGenerator:
         # This is a simplified implementation
         # In a real implementation, you would use NLP to extract key points
         
-        # Split into sentences
-        import re
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        
-        # Filter out short sentences
-        sentences = [s for s in sentences if len(s.split()) > 5]
+        # Split into sentences, keeping only substantial ones; counting
+        # spaces is a cheap word-count proxy that avoids splitting every
+        # sentence just to measure it
+        sentences = [s for s in _SENT_SPLIT.split(text) if s.count(' ') + 1 > 5]
         
         # Select sentences that might be key points (every N sentences)
         if len(sentences) <= max_points:
             return sentences
-        else:
-            step = len(sentences) // max_points
-            return [sentences[i] for i in range(0, len(sentences), step)][:max_points]
+        step = max(1, len(sentences) // max_points)
+        return sentences[::step][:max_points]
     
     def _process_segment(self, audio_path: str, segment: Dict[str, Any], 
                        meeting_title: str, use_voice_narration: bool,
@@ -207,6 +285,11 @@ class PodcastGenerator:
         Returns:
             Path to the generated podcast snippet
         """
+        # One timestamp per segment: filenames and metadata must agree,
+        # and parallel workers need a stable value
+        now = datetime.now()
+        ts = now.strftime('%Y%m%d_%H%M%S')
+
         # Get segment title
         segment_title = segment.get('title', f"Segment {segment_index+1}")
         
@@ -217,13 +300,16 @@ class PodcastGenerator:
         start_time = segment.get('start_time', 0)
         end_time = segment.get('end_time', 60)  # Default to 1 minute
         
-        # Extract segment from audio
-        segment_path = self.ffmpeg_processor.extract_segment(audio_path, start_time, end_time)
-        
-        # Enhance audio quality
-        segment_path = self.ffmpeg_processor.normalize_audio(segment_path)
-        segment_path = self.ffmpeg_processor.remove_noise(segment_path)
-        
+        # Extract, normalize, denoise and encode in a single ffmpeg pass
+        # instead of four subprocess invocations per segment
+        processed_path = os.path.join(
+            self.ffmpeg_processor.temp_dir,
+            f"{os.path.splitext(os.path.basename(audio_path))[0]}_{int(start_time)}_{int(end_time)}_processed.mp3"
+        )
+        segment_path = self.ffmpeg_processor.process_pipeline(
+            audio_path, start_time, end_time, processed_path
+        )
+
         # Add voice narration if requested
         if use_voice_narration:
             intro_text = f"Here's a quick snippet from our session on {segment_title}..."
@@ -235,16 +321,21 @@ class PodcastGenerator:
                 outro_text
             )
         
-        # Create output path
-        safe_title = "".join(c if c.isalnum() else "_" for c in segment_title)
+        # Create output path, keeping the processed file's format
+        safe_title = _SAFE_TITLE.sub('_', segment_title).strip('_') or 'segment'
+        output_ext = os.path.splitext(segment_path)[1] or '.mp3'
         output_path = os.path.join(
             self.output_dir,
-            f"podcast_{safe_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav"
+            f"podcast_{safe_title}_{ts}_{segment_index}{output_ext}"
         )
         
-        # Copy to output directory
-        import shutil
-        shutil.copy(segment_path, output_path)
+        # Publish into the output directory: a hardlink is free when temp
+        # and output share a filesystem, and copyfile's sendfile path skips
+        # the mode-bit stat/chmod shutil.copy would add
+        try:
+            os.link(segment_path, output_path)
+        except OSError:
+            shutil.copyfile(segment_path, output_path)
         
         # Get duration
         duration_sec = self.ffmpeg_processor.get_audio_duration(output_path)
@@ -254,7 +345,7 @@ class PodcastGenerator:
             "title": segment_title,
             "description": segment_description,
             "meeting_title": meeting_title,
-            "created_at": datetime.now().isoformat(),
+            "created_at": now.isoformat(),
             "duration_sec": duration_sec,
             "key_points": segment.get('key_points', [])
         }
@@ -263,15 +354,25 @@ class PodcastGenerator:
         with open(metadata_path, 'w') as f:
             json.dump(metadata, f, indent=2)
         
-        # Create MP3 version for better compatibility
+        try:
+            self._index.add(os.path.basename(output_path), metadata)
+        except Exception as e:
+            logger.warning(f"Failed to index podcast metadata: {str(e)}")
+        
+        # The fused pipeline already encodes MP3; only re-export when
+        # narration produced a different format
+        if output_ext == '.mp3':
+            logger.info(f"Created podcast segment: {output_path}")
+            return output_path
+
         try:
             mp3_path = self.ffmpeg_processor.export_as_mp3(output_path)
-            
+
             # Update metadata for MP3
             mp3_metadata_path = os.path.splitext(mp3_path)[0] + '.json'
             with open(mp3_metadata_path, 'w') as f:
                 json.dump(metadata, f, indent=2)
-                
+
             logger.info(f"Created podcast segment: {mp3_path}")
             return mp3_path
         except Exception as e:
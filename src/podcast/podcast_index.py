@@ -0,0 +1,89 @@
+"""
+SQLite-backed index of generated podcast metadata
+"""
+
+import os
+import json
+import sqlite3
+import logging
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class PodcastIndex:
+    """Single-query index over podcast metadata sidecars"""
+
+    def __init__(self, output_dir: Optional[str] = None):
+        """
+        Initialize the podcast index
+
+        Args:
+            output_dir: Directory holding the podcasts (defaults to ./output_podcasts)
+        """
+        self.output_dir = output_dir or os.getenv("OUTPUT_DIR", "./output_podcasts")
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.db_path = os.path.join(self.output_dir, "podcasts.sqlite")
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS podcasts (
+                    filename TEXT PRIMARY KEY,
+                    title TEXT,
+                    description TEXT,
+                    created_at TEXT,
+                    duration_sec REAL,
+                    key_points TEXT
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection; one per call keeps the index thread-safe"""
+        return sqlite3.connect(self.db_path)
+
+    def add(self, filename: str, metadata: Dict[str, Any]) -> None:
+        """
+        Record (or update) a podcast's metadata at generation time
+
+        Args:
+            filename: Podcast file name within the output directory
+            metadata: Metadata dictionary as written to the JSON sidecar
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO podcasts VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    filename,
+                    metadata.get("title", filename),
+                    metadata.get("description", ""),
+                    metadata.get("created_at", ""),
+                    metadata.get("duration_sec", 0),
+                    json.dumps(metadata.get("key_points", [])),
+                )
+            )
+
+    def list_all(self) -> List[Dict[str, Any]]:
+        """
+        List all indexed podcasts, newest first
+
+        Returns:
+            List of metadata dictionaries
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT filename, title, description, created_at, duration_sec, key_points "
+                "FROM podcasts ORDER BY created_at DESC"
+            ).fetchall()
+
+        return [
+            {
+                "filename": filename,
+                "title": title,
+                "description": description,
+                "created_at": created_at,
+                "duration_sec": duration_sec,
+                "key_points": json.loads(key_points or "[]"),
+            }
+            for filename, title, description, created_at, duration_sec, key_points in rows
+        ]
@@ -3,13 +3,51 @@ AssemblyAI client for speech-to-text transcription
 """
 
 import os
+import json
 import time
+import hashlib
 import logging
+import tempfile
+import threading
+import ffmpeg
+import requests
 import assemblyai as aai
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 
 logger = logging.getLogger(__name__)
 
+class _TokenBucket:
+    """Thread-safe token bucket for pacing API calls"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self._rate = float(rate)
+        self._capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._last) * self._rate
+                )
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._rate
+            time.sleep(wait)
+
+# AssemblyAI allows 20k requests per 5 minutes (~66/sec); pacing at 60/sec
+# keeps parallel chunk transcription under the limit rather than tripping
+# 429 retry storms
+_RATE_LIMITER = _TokenBucket(rate=60, capacity=60)
+
 class AssemblyClient:
     """Client for interacting with AssemblyAI API for transcription"""
     
@@ -22,6 +60,13 @@ class AssemblyClient:
         """
         self.api_key = api_key or os.getenv("ASSEMBLY_API_KEY")
         
+        # Results are cached on disk by audio content hash: re-running a
+        # method on the same file skips the upload and the ASR pass
+        self._cache_dir = os.path.join(
+            os.getenv("TEMP_AUDIO_DIR", "./temp_audio"), ".asr_cache"
+        )
+        os.makedirs(self._cache_dir, exist_ok=True)
+        
         # Check if API key is available
         if not self.api_key:
             logger.warning("AssemblyAI API key not provided. Using placeholder responses.")
@@ -30,6 +75,93 @@ class AssemblyClient:
             # Configure the AssemblyAI client
             aai.settings.api_key = self.api_key
             self.using_placeholders = False
+            # Pooled session for chunked uploads, reused across files
+            self._upload_session = requests.Session()
+            self._upload_session.headers["authorization"] = self.api_key
+    
+    @staticmethod
+    def _file_sha(audio_path: str) -> str:
+        """Hash the full file content in 1MB chunks"""
+        hasher = hashlib.sha256()
+        with open(audio_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+    
+    def _cache_load(self, method: str, audio_path: str):
+        """Load a cached result for (method, content hash), or None"""
+        cache_path = os.path.join(
+            self._cache_dir, f"{method}_{self._file_sha(audio_path)}.json"
+        )
+        try:
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _cache_store(self, method: str, audio_path: str, result) -> None:
+        """Write a result to the on-disk cache"""
+        cache_path = os.path.join(
+            self._cache_dir, f"{method}_{self._file_sha(audio_path)}.json"
+        )
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump(result, f)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {cache_path}: {str(e)}")
+    
+    def _upload_stream(self, audio_path: str) -> str:
+        """
+        Upload a local file to AssemblyAI in 5MB chunks
+        
+        Streaming the body avoids reading a multi-hundred-MB WAV into
+        memory before the upload even starts.
+        
+        Args:
+            audio_path: Path to the audio file
+            
+        Returns:
+            Upload URL to pass to the transcriber
+        """
+        with open(audio_path, 'rb') as f:
+            response = self._upload_session.post(
+                "https://api.assemblyai.com/v2/upload",
+                data=iter(lambda: f.read(5 << 20), b"")
+            )
+        response.raise_for_status()
+        return response.json()["upload_url"]
+    
+    def _transcribe(self, audio_path: str, config: Optional["aai.TranscriptionConfig"] = None):
+        """
+        Submit a transcription job and poll it at a tight interval
+        
+        The SDK's blocking transcribe() polls every few seconds, so short
+        clips spend most of their latency waiting between polls; a 0.5s
+        interval removes most of that idle tail. Local files are streamed
+        up through _upload_stream first.
+        
+        Args:
+            audio_path: Path to the audio file
+            config: Optional transcription configuration
+            
+        Returns:
+            Completed (or errored) transcript object
+        """
+        source = audio_path
+        if os.path.exists(audio_path):
+            try:
+                source = self._upload_stream(audio_path)
+            except Exception as e:
+                logger.warning(f"Streamed upload failed, falling back to SDK upload: {str(e)}")
+        
+        transcriber = aai.Transcriber(config=config) if config else aai.Transcriber()
+        _RATE_LIMITER.acquire()
+        transcript = transcriber.submit(source)
+        while transcript.status not in ("completed", "error"):
+            time.sleep(0.5)
+            _RATE_LIMITER.acquire()
+            transcript = aai.Transcript.get_by_id(transcript.id)
+        return transcript
     
     def transcribe_audio(self, audio_path: str) -> str:
         """
@@ -46,17 +178,20 @@ class AssemblyClient:
             logger.info(f"Using placeholder transcription for {audio_path}")
             return "This is a placeholder transcript. The actual transcription would appear here."
         
+        cached = self._cache_load("transcribe", audio_path)
+        if cached is not None:
+            logger.info(f"Using cached transcription for {audio_path}")
+            return cached
+        
         try:
-            # Create a transcriber
-            transcriber = aai.Transcriber()
-            
             # Start transcription
             logger.info(f"Starting transcription for {audio_path}")
-            transcript = transcriber.transcribe(audio_path)
+            transcript = self._transcribe(audio_path)
             
             # Return the transcribed text
             if transcript.status == "completed":
                 logger.info(f"Transcription completed: {len(transcript.text)} characters")
+                self._cache_store("transcribe", audio_path, transcript.text)
                 return transcript.text
             else:
                 logger.error(f"Transcription failed with status: {transcript.status}")
@@ -67,6 +202,65 @@ class AssemblyClient:
             logger.error(f"Error transcribing audio with AssemblyAI: {str(e)}")
             raise
     
+    def transcribe_audio_parallel(self, audio_path: str, max_concurrent: int = 5,
+                                  chunk_seconds: int = 300) -> str:
+        """
+        Transcribe long audio by splitting it and transcribing chunks in parallel
+        
+        A single job's latency grows with audio length; five-minute
+        chunks submitted concurrently finish in roughly the time of the
+        longest chunk. Splitting uses a stream copy, so no re-encode.
+        
+        Args:
+            audio_path: Path to the audio file
+            max_concurrent: Maximum chunks transcribed at once
+            chunk_seconds: Target chunk length in seconds
+            
+        Returns:
+            Transcription text stitched in chunk order
+        """
+        if hasattr(self, 'using_placeholders') and self.using_placeholders:
+            return self.transcribe_audio(audio_path)
+        
+        try:
+            duration = float(ffmpeg.probe(audio_path)["format"]["duration"])
+        except Exception as e:
+            logger.warning(f"Could not probe {audio_path}, transcribing whole file: {str(e)}")
+            return self.transcribe_audio(audio_path)
+        
+        if duration <= chunk_seconds:
+            return self.transcribe_audio(audio_path)
+        
+        # Splice copy-only chunks into a scratch directory
+        chunk_dir = tempfile.mkdtemp(prefix="asr_chunks_")
+        ext = os.path.splitext(audio_path)[1] or ".wav"
+        chunk_paths = []
+        for i, start in enumerate(range(0, int(duration), chunk_seconds)):
+            chunk_path = os.path.join(chunk_dir, f"chunk_{i:03d}{ext}")
+            (
+                ffmpeg
+                .input(audio_path, ss=start, t=chunk_seconds)
+                .output(chunk_path, c='copy')
+                .run(quiet=True, overwrite_output=True)
+            )
+            chunk_paths.append(chunk_path)
+        
+        try:
+            logger.info(f"Transcribing {len(chunk_paths)} chunks in parallel")
+            with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+                texts = list(executor.map(self.transcribe_audio, chunk_paths))
+            return " ".join(texts)
+        finally:
+            for path in chunk_paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            try:
+                os.rmdir(chunk_dir)
+            except OSError:
+                pass
+    
     def transcribe_audio_with_speaker_diarization(self, audio_path: str) -> Dict[str, Any]:
         """
         Transcribe audio with speaker diarization
@@ -88,40 +282,73 @@ class AssemblyClient:
                 ]
             }
         
+        result = self.transcribe_full(audio_path)
+        return {"text": result["text"], "utterances": result["utterances"]}
+    
+    def transcribe_full(self, audio_path: str) -> Dict[str, Any]:
+        """
+        Transcribe audio with speaker diarization and topic chapters in one pass
+        
+        Callers that need both utterances and chapters previously paid
+        two full upload + ASR passes over the same audio; one combined
+        configuration halves that.
+        
+        Args:
+            audio_path: Path to the audio file
+            
+        Returns:
+            Dictionary with text, utterances and chapters
+        """
+        cached = self._cache_load("full", audio_path)
+        if cached is not None:
+            logger.info(f"Using cached full transcription for {audio_path}")
+            return cached
+        
         try:
-            # Create a transcriber with speaker diarization
-            config = aai.TranscriptionConfig(speaker_labels=True)
-            transcriber = aai.Transcriber(config=config)
+            # Request everything at once
+            config = aai.TranscriptionConfig(
+                speaker_labels=True,
+                auto_chapters=True,
+                punctuate=True,
+                format_text=True
+            )
             
             # Start transcription
-            logger.info(f"Starting diarized transcription for {audio_path}")
-            transcript = transcriber.transcribe(audio_path)
+            logger.info(f"Starting full transcription for {audio_path}")
+            transcript = self._transcribe(audio_path, config)
             
             # Process the result
             if transcript.status == "completed":
-                logger.info(f"Diarized transcription completed")
+                logger.info(f"Full transcription completed")
                 
-                # Extract utterances
-                utterances = []
-                for utterance in transcript.utterances:
-                    utterances.append({
-                        "speaker": utterance.speaker,
-                        "text": utterance.text,
-                        "start": utterance.start,
-                        "end": utterance.end
-                    })
+                # Extract utterances and chapters; comprehensions avoid
+                # the per-iteration append lookup, which adds up over the
+                # thousands of utterances a long podcast produces
+                utterances = [
+                    {"speaker": u.speaker, "text": u.text, "start": u.start, "end": u.end}
+                    for u in transcript.utterances or []
+                ]
                 
-                return {
+                chapters = [
+                    {"topic": c.headline, "start": c.start, "end": c.end,
+                     "summary": c.summary, "gist": c.gist}
+                    for c in transcript.chapters or []
+                ]
+                
+                result = {
                     "text": transcript.text,
-                    "utterances": utterances
+                    "utterances": utterances,
+                    "chapters": chapters
                 }
+                self._cache_store("full", audio_path, result)
+                return result
             else:
-                logger.error(f"Diarized transcription failed with status: {transcript.status}")
+                logger.error(f"Full transcription failed with status: {transcript.status}")
                 if transcript.error:
                     logger.error(f"Error: {transcript.error}")
-                return {"text": "", "utterances": []}
+                return {"text": "", "utterances": [], "chapters": []}
         except Exception as e:
-            logger.error(f"Error with diarized transcription: {str(e)}")
+            logger.error(f"Error with full transcription: {str(e)}")
             raise
     
     def detect_key_topics(self, audio_path: str) -> List[Dict[str, Any]]:
@@ -143,34 +370,4 @@ class AssemblyClient:
                 {"topic": "Conclusion", "start": 180, "end": 240, "confidence": 0.95}
             ]
         
-        try:
-            # Create a transcriber with topic detection
-            config = aai.TranscriptionConfig(auto_chapters=True)
-            transcriber = aai.Transcriber(config=config)
-            
-            # Start transcription
-            logger.info(f"Starting topic detection for {audio_path}")
-            transcript = transcriber.transcribe(audio_path)
-            
-            # Process the result
-            if transcript.status == "completed" and transcript.chapters:
-                logger.info(f"Topic detection completed: {len(transcript.chapters)} topics found")
-                
-                # Extract topics
-                topics = []
-                for chapter in transcript.chapters:
-                    topics.append({
-                        "topic": chapter.headline,
-                        "start": chapter.start,
-                        "end": chapter.end,
-                        "summary": chapter.summary,
-                        "gist": chapter.gist
-                    })
-                
-                return topics
-            else:
-                logger.error(f"Topic detection failed or no topics found")
-                return []
-        except Exception as e:
-            logger.error(f"Error detecting topics: {str(e)}")
-            raise
+        return self.transcribe_full(audio_path)["chapters"]
@@ -3,16 +3,53 @@ Voice generator for podcast narration using ElevenLabs and Google TTS
 """
 
 import os
+import re
+import json
+import wave
+import types
+import functools
+import shutil
+import hashlib
 import logging
 import tempfile
-import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 import requests
 from google.cloud import texttospeech
+from google.cloud.texttospeech_v1.services.text_to_speech.transports import TextToSpeechGrpcTransport
 import ffmpeg
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundaries for splitting long narration into TTS-sized chunks
+_SENT_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Text longer than this is split and synthesized as parallel requests
+_MAX_CHUNK_CHARS = 250
+
+@functools.lru_cache(maxsize=1)
+def _silence_master() -> bytes:
+    """One minute of 44.1kHz stereo 16-bit zeros, built once per process"""
+    return b"\x00" * (60 * 44100 * 4)
+
+# Final narration formats: codec, extension, bitrate. Opus/AAC cut the
+# output 10-100x versus PCM for spoken audio at the same perceived quality
+_NARRATION_FORMATS = {
+    "wav": ("pcm_s16le", ".wav", None),
+    "opus": ("libopus", ".opus", "48k"),
+    "m4a": ("aac", ".m4a", "96k"),
+}
+
+# ElevenLabs voice name to ID mapping
+_VOICE_IDS = types.MappingProxyType({
+    "Rachel": "21m00Tcm4TlvDq8ikWAM",
+    "Domi": "AZnzlk1XvdvUeBnXmlld",
+    "Bella": "EXAVITQu4vr4xnSDxMaL",
+    "Antoni": "ErXwobaYiN019PkySvjV",
+    "Thomas": "GBv7mTt0atIp3Br8iCZE",
+    "Charlie": "IKne3meq5aSn9XLyUdCD"
+})
+
 class VoiceGenerator:
     """Generate voice narration for podcasts using various TTS providers"""
     
@@ -34,17 +71,44 @@ class VoiceGenerator:
             self.elevenlabs_api_key = os.getenv("ELEVENLABS_API_KEY")
             self.elevenlabs_voice = os.getenv("ELEVENLABS_VOICE", "Rachel")
             
+            # The voice never changes after construction, so resolve the
+            # ID and endpoint URL once instead of per synthesis call
+            self._voice_id = _VOICE_IDS.get(self.elevenlabs_voice, _VOICE_IDS["Rachel"])
+            self._el_url = f"https://api.elevenlabs.io/v1/text-to-speech/{self._voice_id}/stream"
+            
             if not self.elevenlabs_api_key:
                 logger.warning("ElevenLabs API key not provided. Using placeholder responses.")
                 self.using_placeholders = True
             else:
                 self.using_placeholders = False
+                # Pooled session: repeated narration calls reuse the TLS
+                # connection to api.elevenlabs.io instead of handshaking
+                # per request, and the static headers are set once
+                self._http = requests.Session()
+                self._http.headers.update({
+                    "Accept": "audio/mpeg",
+                    "Content-Type": "application/json",
+                    "xi-api-key": self.elevenlabs_api_key
+                })
+                self._http.mount(
+                    "https://",
+                    requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+                )
         
         # Initialize Google TTS if selected
         elif self.provider == "google":
             try:
                 self.google_voice = os.getenv("GOOGLE_VOICE", "en-US-Standard-A")
-                self.google_client = texttospeech.TextToSpeechClient()
+                # One explicit gRPC channel for the generator's lifetime:
+                # concurrent narration calls multiplex over it instead of
+                # paying per-call channel setup, and the raised message cap
+                # lets long narration responses arrive in one message
+                channel = TextToSpeechGrpcTransport.create_channel(
+                    options=[("grpc.max_receive_message_length", 30 * 1024 * 1024)]
+                )
+                self.google_client = texttospeech.TextToSpeechClient(
+                    transport=TextToSpeechGrpcTransport(channel=channel)
+                )
                 self.using_placeholders = False
             except Exception as e:
                 logger.warning(f"Error initializing Google TTS: {str(e)}")
@@ -54,6 +118,14 @@ class VoiceGenerator:
         else:
             logger.warning(f"Unknown voice provider: {self.provider}. Using placeholder responses.")
             self.using_placeholders = True
+        
+        # Bind the synthesis path once; generate_voice becomes a cache
+        # check plus one pre-resolved call instead of re-walking the
+        # provider branch chain per request
+        if self.using_placeholders:
+            self._generate = self._generate_placeholder
+        else:
+            self._generate = self._synthesize
     
     def generate_voice(self, text: str, output_path: Optional[str] = None) -> str:
         """
@@ -66,29 +138,122 @@ class VoiceGenerator:
         Returns:
             Path to the generated audio file
         """
-        # Create output path if not provided
-        if not output_path:
-            output_path = os.path.join(
-                self.temp_dir, 
-                f"voice_{hash(text) % 10000:04d}.wav"
-            )
+        # Content-addressed cache path: the same provider/voice/text always
+        # maps to the same file, so repeated boilerplate narration (intros,
+        # outros) is synthesized once per cache lifetime instead of per run
+        key = hashlib.sha256(
+            f"{self.provider}|{getattr(self, 'elevenlabs_voice', '')}"
+            f"{getattr(self, 'google_voice', '')}|{text}".encode()
+        ).hexdigest()[:32]
+        # Name the file after what it actually contains so FFmpeg probes
+        # it correctly: ElevenLabs returns MP3, everything else is WAV
+        ext = '.mp3' if self.provider == "elevenlabs" and not self.using_placeholders else '.wav'
+        cached_path = os.path.join(self.temp_dir, f"voice_{key}{ext}")
         
-        # If using placeholders, create a silent audio file
-        if hasattr(self, 'using_placeholders') and self.using_placeholders:
-            logger.info(f"Using placeholder voice for text: {text[:50]}...")
-            self._create_silent_audio(output_path, duration=len(text.split()) * 0.3)  # Rough estimate
+        if os.path.exists(cached_path) and os.path.getsize(cached_path) > 0:
+            logger.info(f"Using cached voice for text: {text[:50]}...")
+        else:
+            cached_path = self._generate(text, cached_path)
+        
+        # Publish to the caller's requested path without re-synthesizing
+        if output_path and output_path != cached_path:
+            try:
+                os.link(cached_path, output_path)
+            except OSError:
+                shutil.copyfile(cached_path, output_path)
             return output_path
+        return cached_path
+    
+    def _generate_placeholder(self, text: str, output_path: str) -> str:
+        """
+        Create placeholder silence roughly matching the narration length
         
-        # Generate voice based on provider
-        if self.provider == "elevenlabs":
-            return self._generate_elevenlabs_voice(text, output_path)
-        elif self.provider == "google":
-            return self._generate_google_voice(text, output_path)
-        else:
-            # Fallback to placeholder
-            logger.warning(f"Unknown provider {self.provider}, using placeholder")
-            self._create_silent_audio(output_path, duration=len(text.split()) * 0.3)
+        Args:
+            text: Text the placeholder stands in for
+            output_path: Path to save the audio file
+            
+        Returns:
+            Path to the generated audio file
+        """
+        logger.info(f"Using placeholder voice for text: {text[:50]}...")
+        self._create_silent_audio(output_path, duration=len(text.split()) * 0.3)  # Rough estimate
+        return output_path
+    
+    @staticmethod
+    def _chunk_text(text: str) -> list:
+        """
+        Group sentences into chunks of at most _MAX_CHUNK_CHARS characters
+        
+        Args:
+            text: Text to split
+            
+        Returns:
+            List of text chunks in order
+        """
+        chunks = []
+        current = []
+        current_len = 0
+        for sentence in _SENT_SPLIT.split(text):
+            if current and current_len + len(sentence) > _MAX_CHUNK_CHARS:
+                chunks.append(' '.join(current))
+                current = []
+                current_len = 0
+            current.append(sentence)
+            current_len += len(sentence) + 1
+        if current:
+            chunks.append(' '.join(current))
+        return chunks
+    
+    def _synthesize(self, text: str, output_path: str) -> str:
+        """
+        Synthesize text with the configured provider
+        
+        Long text is split on sentence boundaries and the chunks are
+        synthesized concurrently, then stitched with FFmpeg's concat
+        demuxer without re-encoding — end-to-end latency tracks the
+        longest chunk instead of the whole text.
+        
+        Args:
+            text: Text to convert to speech
+            output_path: Path to save the audio file
+            
+        Returns:
+            Path to the generated audio file
+        """
+        synth = (self._generate_elevenlabs_voice if self.provider == "elevenlabs"
+                 else self._generate_google_voice)
+        
+        if len(text) <= _MAX_CHUNK_CHARS:
+            return synth(text, output_path)
+        
+        chunks = self._chunk_text(text)
+        chunk_paths = [f"{output_path}.part{i}" for i in range(len(chunks))]
+        
+        try:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(synth, chunks, chunk_paths))
+            
+            # Stitch the chunks with the concat demuxer; all parts share
+            # the provider's output format so a stream copy is enough
+            list_path = f"{output_path}.list.txt"
+            with open(list_path, 'w') as f:
+                for path in chunk_paths:
+                    f.write(f"file '{os.path.abspath(path)}'\n")
+            
+            (
+                ffmpeg
+                .input(list_path, format='concat', safe=0)
+                .output(output_path, c='copy')
+                .run(quiet=True, overwrite_output=True)
+            )
+            
             return output_path
+        finally:
+            for path in chunk_paths + [f"{output_path}.list.txt"]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
     
     def _generate_elevenlabs_voice(self, text: str, output_path: str) -> str:
         """
@@ -102,33 +267,37 @@ class VoiceGenerator:
             Path to the generated audio file
         """
         try:
-            # ElevenLabs API endpoint
-            url = f"https://api.elevenlabs.io/v1/text-to-speech/{self._get_elevenlabs_voice_id()}"
-            
-            # Request headers
-            headers = {
-                "Accept": "audio/mpeg",
-                "Content-Type": "application/json",
-                "xi-api-key": self.elevenlabs_api_key
-            }
-            
-            # Request data
+            # ElevenLabs streaming endpoint: audio chunks are written to
+            # disk as they are synthesized instead of waiting for the
+            # whole response, so long narration is usable much sooner
+            # Request data; the turbo model synthesizes markedly faster
+            # than the monolingual v1 model at equivalent narration quality
             data = {
                 "text": text,
-                "model_id": "eleven_monolingual_v1",
+                "model_id": "eleven_turbo_v2_5",
                 "voice_settings": {
                     "stability": 0.5,
                     "similarity_boost": 0.5
                 }
             }
             
-            # Make request
-            response = requests.post(url, json=data, headers=headers)
+            # Make request and stream the body straight to the file; the
+            # 22.05kHz/32kbps format cuts download bytes ~4x with no
+            # audible cost for spoken narration that gets re-encoded
+            # downstream anyway
+            response = self._http.post(
+                self._el_url, json=data,
+                params={
+                    "optimize_streaming_latency": 4,
+                    "output_format": "mp3_22050_32"
+                },
+                stream=True, timeout=30
+            )
             response.raise_for_status()
             
-            # Save audio to file
             with open(output_path, 'wb') as f:
-                f.write(response.content)
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
             
             logger.info(f"Generated ElevenLabs voice: {output_path}")
             return output_path
@@ -171,9 +340,20 @@ class VoiceGenerator:
                 input=synthesis_input, voice=voice, audio_config=audio_config
             )
             
-            # Save the audio to file
-            with open(output_path, "wb") as out:
-                out.write(response.audio_content)
+            # Save the audio to file. LINEAR16 responses normally carry a
+            # RIFF header already; raw PCM gets wrapped in one so the
+            # copy-concat path downstream never has to sniff headerless
+            # audio or fall back to a re-encode
+            audio = response.audio_content
+            if audio[:4] == b'RIFF':
+                with open(output_path, "wb") as out:
+                    out.write(audio)
+            else:
+                with wave.open(output_path, 'wb') as w:
+                    w.setnchannels(1)
+                    w.setsampwidth(2)
+                    w.setframerate(44100)
+                    w.writeframes(audio)
             
             logger.info(f"Generated Google TTS voice: {output_path}")
             return output_path
@@ -193,13 +373,22 @@ class VoiceGenerator:
             duration: Duration of silence in seconds
         """
         try:
-            # Create silent audio using FFmpeg
-            (
-                ffmpeg
-                .input(f"anullsrc=r=44100:cl=stereo", f="lavfi", t=duration)
-                .output(output_path, acodec='pcm_s16le', ar=44100, ac=2)
-                .run(quiet=True, overwrite_output=True)
-            )
+            # Write the zeros directly with the wave module — same
+            # pcm_s16le/44.1kHz/stereo output as before, without forking
+            # an FFmpeg process just to generate silence. Placeholders up
+            # to a minute slice the shared master buffer instead of
+            # allocating fresh zeros per call
+            n_bytes = int(duration * 44100) * 4
+            master = _silence_master()
+            if n_bytes <= len(master):
+                frames = memoryview(master)[:n_bytes]
+            else:
+                frames = b"\x00" * n_bytes
+            with wave.open(output_path, 'wb') as w:
+                w.setnchannels(2)
+                w.setsampwidth(2)
+                w.setframerate(44100)
+                w.writeframes(frames)
             
             logger.info(f"Created silent audio: {output_path}")
         except Exception as e:
@@ -208,28 +397,8 @@ class VoiceGenerator:
             with open(output_path, 'wb') as f:
                 f.write(b'')
     
-    def _get_elevenlabs_voice_id(self) -> str:
-        """
-        Get the ElevenLabs voice ID for the selected voice
-        
-        Returns:
-            Voice ID string
-        """
-        # Voice name to ID mapping
-        voice_ids = {
-            "Rachel": "21m00Tcm4TlvDq8ikWAM",
-            "Domi": "AZnzlk1XvdvUeBnXmlld",
-            "Bella": "EXAVITQu4vr4xnSDxMaL",
-            "Antoni": "ErXwobaYiN019PkySvjV",
-            "Thomas": "GBv7mTt0atIp3Br8iCZE",
-            "Charlie": "IKne3meq5aSn9XLyUdCD"
-        }
-        
-        # Return the ID for the selected voice, or Rachel as default
-        return voice_ids.get(self.elevenlabs_voice, voice_ids["Rachel"])
-    
     def add_narration(self, audio_path: str, intro_text: Optional[str] = None, 
-                     outro_text: Optional[str] = None) -> str:
+                     outro_text: Optional[str] = None, output_format: str = "wav") -> str:
         """
         Add narration intro and outro to an audio file
         
@@ -237,30 +406,39 @@ class VoiceGenerator:
             audio_path: Path to the audio file
             intro_text: Text for intro narration
             outro_text: Text for outro narration
+            output_format: Final container — "wav", "opus" or "m4a"
             
         Returns:
             Path to the audio with narration added
         """
+        codec, out_ext, bitrate = _NARRATION_FORMATS.get(
+            output_format, _NARRATION_FORMATS["wav"]
+        )
+        if codec == 'pcm_s16le':
+            encode_kwargs = {'acodec': codec, 'ar': 44100, 'ac': 2}
+        else:
+            encode_kwargs = {'acodec': codec, 'audio_bitrate': bitrate, 'ar': 48000, 'ac': 2}
         try:
             # Create temporary directory for files
             temp_dir = tempfile.mkdtemp(dir=self.temp_dir)
             
-            # Generate intro if provided
-            intro_path = None
-            if intro_text:
-                intro_path = os.path.join(temp_dir, "intro.wav")
-                self.generate_voice(intro_text, intro_path)
-            
-            # Generate outro if provided
-            outro_path = None
-            if outro_text:
-                outro_path = os.path.join(temp_dir, "outro.wav")
-                self.generate_voice(outro_text, outro_path)
+            # Synthesize every narration segment concurrently. Mapping
+            # over a list means additional segments (e.g. mid-roll
+            # inserts) would scale without further changes here, and
+            # generate_voice picks the extension matching the provider's
+            # actual output
+            narration_texts = [t for t in (intro_text, outro_text) if t]
+            with ThreadPoolExecutor(max_workers=max(1, len(narration_texts))) as executor:
+                narration_paths = dict(
+                    zip(narration_texts, executor.map(self.generate_voice, narration_texts))
+                )
+            intro_path = narration_paths.get(intro_text)
+            outro_path = narration_paths.get(outro_text)
             
             # Create output path
             output_path = os.path.join(
                 self.temp_dir, 
-                f"{os.path.splitext(os.path.basename(audio_path))[0]}_with_narration.wav"
+                f"{os.path.splitext(os.path.basename(audio_path))[0]}_with_narration{out_ext}"
             )
             
             # Concatenate files
@@ -274,15 +452,33 @@ class VoiceGenerator:
                 files_to_concat.append(outro_path)
             
             # If only one file, just copy it
+            extensions = {os.path.splitext(path)[1].lower() for path in files_to_concat}
             if len(files_to_concat) == 1:
                 (
                     ffmpeg
                     .input(files_to_concat[0])
-                    .output(output_path, acodec='pcm_s16le', ar=44100, ac=2)
+                    .output(output_path, **encode_kwargs)
                     .run(quiet=True, overwrite_output=True)
                 )
+            elif len(extensions) == 1:
+                # All segments share a container: the concat demuxer can
+                # byte-concatenate the streams without a decode+re-encode
+                # pass over the whole narration. Transcoding only happens
+                # at this final mux when a compressed format is requested
+                list_path = os.path.join(temp_dir, "concat_list.txt")
+                with open(list_path, 'w') as f:
+                    for path in files_to_concat:
+                        f.write(f"file '{os.path.abspath(path)}'\n")
+                
+                concat_input = ffmpeg.input(list_path, format='concat', safe=0)
+                if out_ext in extensions:
+                    output = concat_input.output(output_path, c='copy')
+                else:
+                    output = concat_input.output(output_path, **encode_kwargs)
+                output.run(quiet=True, overwrite_output=True)
             else:
-                # Build filter complex for concatenation
+                # Mixed formats: fall back to decoding through a concat
+                # filter graph
                 inputs = []
                 for path in files_to_concat:
                     inputs.append(ffmpeg.input(path))
@@ -298,7 +494,7 @@ class VoiceGenerator:
                 # Run FFmpeg command
                 (
                     ffmpeg
-                    .output(*inputs, output_path, filter_complex=''.join(filter_complex), map="[out]", acodec='pcm_s16le', ar=44100, ac=2)
+                    .output(*inputs, output_path, filter_complex=''.join(filter_complex), map="[out]", **encode_kwargs)
                     .run(quiet=True, overwrite_output=True)
                 )
             
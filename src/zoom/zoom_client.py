@@ -5,6 +5,7 @@ Zoom API client for joining and recording meetings
 import os
 import time
 import json
+import base64
 import logging
 import tempfile
 import requests
@@ -16,6 +17,29 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Try to use orjson for the WebSocket hot path; it parses and serializes
+# several times faster than the stdlib json
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+    ORJSON_AVAILABLE = False
+
+# Try to use uvloop for the async recording paths; libuv's readiness
+# dispatch is several times faster than the default selector loop on
+# socket-heavy workloads
+try:
+    import uvloop
+    uvloop.install()
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Try to import pyaudio, but provide a fallback if it's not available
 try:
     import pyaudio
@@ -65,6 +89,11 @@ class ZoomClient:
             "Accept": "application/json"
         }
         
+        # One pooled session reuses the TLS connection to api.zoom.us
+        # across calls instead of handshaking per request
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        
         # Base URL for Zoom API
         self.api_url = "https://api.zoom.us/v2"
         
@@ -88,9 +117,9 @@ class ZoomClient:
         
         try:
             if method.upper() == "GET":
-                response = requests.get(url, headers=self.headers, params=data)
+                response = self._session.get(url, params=data)
             elif method.upper() == "POST":
-                response = requests.post(url, headers=self.headers, json=data)
+                response = self._session.post(url, json=data)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
@@ -103,6 +132,25 @@ class ZoomClient:
                 logger.error(f"Response body: {e.response.text}")
             raise
     
+    async def _make_request_async(self, method: str, endpoint: str,
+                                  data: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Async-safe wrapper around _make_request
+        
+        Runs the pooled blocking request on a worker thread so API calls
+        issued from async code never stall the event loop driving the
+        WebSocket recording coroutines.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint
+            data: Request data
+            
+        Returns:
+            API response as dictionary
+        """
+        return await asyncio.to_thread(self._make_request, method, endpoint, data)
+    
     def get_meeting_info(self, meeting_id: str) -> Dict[str, Any]:
         """
         Get information about a meeting
@@ -157,8 +205,18 @@ class ZoomClient:
         # In reality, this would be derived from the meeting join process
         ws_url = f"wss://zoom.us/meeting/ws/{meeting_id}"
         
-        # Connect to WebSocket
-        websocket = await websockets.connect(ws_url)
+        # Connect to WebSocket. Compression is off because audio frames
+        # don't deflate and the zlib pass per frame is wasted CPU; the
+        # deep recv queue keeps a momentarily slow disk writer from
+        # backpressuring the socket
+        websocket = await websockets.connect(
+            ws_url,
+            compression=None,
+            max_size=2 ** 23,
+            max_queue=16384,
+            ping_interval=20,
+            ping_timeout=20
+        )
         
         # Send join message with credentials
         join_message = {
@@ -166,20 +224,41 @@ class ZoomClient:
             "meeting_id": meeting_id,
             "api_key": self.api_key,
             "api_secret": self.api_secret,
-            "password": password
+            "password": password,
+            # Ask for raw binary audio frames: base64-in-JSON costs 33%
+            # extra wire bytes plus a decode per chunk
+            "audio_encoding": "binary"
         }
         
-        await websocket.send(json.dumps(join_message))
+        await self._send_batch(websocket, [join_message])
         
         # Wait for confirmation
         response = await websocket.recv()
-        response_data = json.loads(response)
+        response_data = _loads(response)
         
         if response_data.get("status") != "success":
             raise Exception(f"Failed to join meeting: {response_data.get('error')}")
         
         return websocket
     
+    @staticmethod
+    async def _send_batch(websocket, messages) -> None:
+        """
+        Send a burst of control messages as a single WebSocket frame
+        
+        Each frame carries its own TCP/TLS overhead, which dwarfs small
+        control payloads; coalescing a burst (join + subscribe + acks as
+        the protocol grows) into one send keeps that overhead constant.
+        
+        Args:
+            websocket: WebSocket connection
+            messages: List of message dictionaries
+        """
+        if len(messages) == 1:
+            await websocket.send(_dumps(messages[0]))
+        else:
+            await websocket.send(_dumps({"batch": messages}))
+    
     async def _record_audio_stream(self, websocket: websockets.WebSocketClientProtocol, 
                                  output_path: str, duration: Optional[int] = None) -> None:
         """
@@ -205,44 +284,75 @@ class ZoomClient:
         wf.setsampwidth(audio.get_sample_size(format))
         wf.setframerate(rate)
         
-        # Start time for duration tracking
-        start_time = time.time()
-        
-        try:
-            logger.info(f"Recording started, saving to {output_path}")
-            
-            # Record until duration is reached or connection is closed
-            while duration is None or (time.time() - start_time) < duration:
-                try:
+        # Coalesce tiny frames into 64KiB writes: one syscall per buffer
+        # instead of one per WebSocket message, and writeframesraw skips
+        # the RIFF header rewrite wave does on every writeframes call
+        buffer = bytearray()
+        
+        # A single deadline timer replaces the per-message wait_for
+        # wrapper, which allocated a fresh timeout handle for every frame
+        # and woke the loop every 100ms even with no data
+        deadline_handle = None
+        if duration is not None:
+            loop = asyncio.get_event_loop()
+            deadline_handle = loop.call_later(
+                duration, lambda: asyncio.ensure_future(websocket.close())
+            )
+        
+        # Bounded hand-off queue between the network and the disk: a
+        # momentary disk stall no longer blocks the next recv, and the
+        # queue's maxsize provides backpressure if the writer falls
+        # far behind
+        queue = asyncio.Queue(maxsize=256)
+        
+        async def _producer():
+            """Pull frames off the socket as fast as they arrive"""
+            try:
+                while True:
                     # Receive audio data from WebSocket
                     # In a real implementation, you would need to parse the Zoom WebSocket protocol
-                    message = await asyncio.wait_for(websocket.recv(), timeout=0.1)
-                    
-                    # Extract audio data from message
-                    # This is a placeholder - actual implementation would depend on Zoom's protocol
-                    if isinstance(message, bytes):
-                        audio_data = message
-                    else:
-                        # If message is JSON, it might be a control message
-                        message_data = json.loads(message)
-                        if message_data.get("type") == "audio":
-                            audio_data = message_data.get("data").encode("base64")
-                        else:
-                            continue
-                    
-                    # Write audio data to file
-                    wf.writeframes(audio_data)
-                    
-                except asyncio.TimeoutError:
-                    # No data received within timeout, continue
-                    continue
-                except websockets.exceptions.ConnectionClosed:
-                    # Connection closed
-                    logger.info("WebSocket connection closed")
+                    await queue.put(await websocket.recv())
+            except websockets.exceptions.ConnectionClosed:
+                # Connection closed
+                logger.info("WebSocket connection closed")
+            finally:
+                await queue.put(None)
+        
+        async def _consumer():
+            """Drain the queue into the wave file in large batches"""
+            while True:
+                message = await queue.get()
+                if message is None:
                     break
+                
+                # Binary frames are the fast path — audio lands as bytes
+                # with no JSON or base64 work at all. Text frames are
+                # control messages (or legacy base64 audio)
+                if isinstance(message, (bytes, bytearray)):
+                    audio_data = message
+                else:
+                    message_data = _loads(message)
+                    if message_data.get("type") == "audio":
+                        audio_data = base64.b64decode(message_data["data"])
+                    else:
+                        continue
+                
+                # Accumulate and flush in large chunks
+                buffer.extend(audio_data)
+                if len(buffer) >= 65536:
+                    wf.writeframesraw(bytes(buffer))
+                    buffer.clear()
+        
+        try:
+            logger.info(f"Recording started, saving to {output_path}")
+            await asyncio.gather(_producer(), _consumer())
         
         finally:
-            # Close wave file and PyAudio
+            if deadline_handle is not None:
+                deadline_handle.cancel()
+            # Flush the tail; wave patches the header on close
+            if buffer:
+                wf.writeframesraw(bytes(buffer))
             wf.close()
             audio.terminate()
             logger.info("Recording stopped")
@@ -299,9 +409,10 @@ class ZoomClient:
         Returns:
             Path to the simulated recording file
         """
-        # Create output file path
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = os.path.join(self.temp_dir, f"simulated_recording_{timestamp}.wav")
+        # Create output file path; a nanosecond counter is far cheaper
+        # than datetime formatting and collision-free when simulations
+        # run back to back in test loops
+        output_path = os.path.join(self.temp_dir, f"simulated_recording_{time.time_ns()}.wav")
         
         # Create a silent WAV file
         format = pyaudio.paInt16
@@ -315,9 +426,17 @@ class ZoomClient:
         wf.setsampwidth(audio.get_sample_size(format))
         wf.setframerate(rate)
         
-        # Generate silence
-        silence = b'\x00' * chunk * channels * (rate // chunk) * duration
-        wf.writeframes(silence)
+        # Write the silence through one reusable 64KiB zero buffer:
+        # peak memory stays flat regardless of duration instead of
+        # materializing the whole recording (minutes of audio means
+        # many MB of zeros) in a single bytes object
+        zeros = bytes(65536)
+        remaining = rate * duration * channels * 2
+        while remaining > 0:
+            n = min(65536, remaining)
+            # writeframesraw defers the header patch to close()
+            wf.writeframesraw(zeros[:n] if n < 65536 else zeros)
+            remaining -= n
         
         wf.close()
         audio.terminate()
@@ -0,0 +1,53 @@
+// Shared front-end behaviour for the web interface. Loaded with defer on
+// every page, so each block guards against elements that page doesn't have.
+
+// File input handling
+const fileInput = document.getElementById('file');
+const fileName = document.getElementById('file-name');
+
+if (fileInput && fileName) {
+    fileInput.addEventListener('change', function() {
+        if (this.files && this.files[0]) {
+            fileName.textContent = this.files[0].name;
+        } else {
+            fileName.textContent = '';
+        }
+    });
+}
+
+// Form submission and loading animation
+const form = document.getElementById('podcast-form');
+const loading = document.getElementById('loading');
+const generateButton = document.getElementById('generate-button');
+
+if (form && loading && generateButton) {
+    form.addEventListener('submit', function() {
+        if (fileInput && fileInput.files && fileInput.files[0]) {
+            loading.style.display = 'block';
+            generateButton.disabled = true;
+        }
+    });
+}
+
+// Theme toggle functionality
+const themeToggle = document.getElementById('theme-toggle');
+
+if (themeToggle) {
+    const themeIcon = themeToggle.querySelector('i');
+    let lightMode = false;
+
+    themeToggle.addEventListener('click', function() {
+        if (lightMode) {
+            document.documentElement.style.setProperty('--dark-bg', '#121212');
+            document.documentElement.style.setProperty('--dark-card', '#1e1e1e');
+            document.documentElement.style.setProperty('--dark-text', '#e0e0e0');
+            themeIcon.className = 'fas fa-moon';
+        } else {
+            document.documentElement.style.setProperty('--dark-bg', '#f8f9fa');
+            document.documentElement.style.setProperty('--dark-card', '#ffffff');
+            document.documentElement.style.setProperty('--dark-text', '#333333');
+            themeIcon.className = 'fas fa-sun';
+        }
+        lightMode = !lightMode;
+    });
+}
@@ -6,19 +6,10 @@ import os
 import tempfile
 import streamlit as st
 from streamlit_option_menu import option_menu
-from streamlit_player import st_player
-import matplotlib.pyplot as plt
-from PIL import Image
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-import base64
-
-# Import project modules
-from src.transcription.assembly_client import AssemblyClient
-from src.audio.ffmpeg_processor import FFmpegProcessor
-from src.tts.voice_generator import VoiceGenerator
-from src.podcast.podcast_generator import PodcastGenerator
 
 # Set page configuration
 st.set_page_config(
@@ -78,9 +69,16 @@ with st.sidebar:
     st.markdown("- FFmpeg for audio processing")
     st.markdown("- ElevenLabs/Google TTS for voice narration")
 
-# Initialize clients
+# Initialize clients. The project imports live here so they (and the
+# heavy SDKs they pull in) load once behind the resource cache instead
+# of on every cold start
 @st.cache_resource
 def load_clients():
+    from src.transcription.assembly_client import AssemblyClient
+    from src.audio.ffmpeg_processor import FFmpegProcessor
+    from src.tts.voice_generator import VoiceGenerator
+    from src.podcast.podcast_generator import PodcastGenerator
+
     assembly_client = AssemblyClient()
     ffmpeg_processor = FFmpegProcessor()
     voice_generator = VoiceGenerator()
@@ -93,43 +91,72 @@ def load_clients():
 
 assembly_client, ffmpeg_processor, voice_generator, podcast_generator = load_clients()
 
-# Function to get list of generated podcasts
-def get_podcasts():
+# Function to get list of generated podcasts. The scan is cached on the
+# directory's mtime: every widget interaction reruns the script, and
+# without the cache each rerun re-stats and re-parses every podcast
+@st.cache_data(show_spinner=False)
+def _scan_podcasts(dir_mtime):
     podcasts = []
     output_dir = "output_podcasts"
     
-    if os.path.exists(output_dir):
-        for filename in os.listdir(output_dir):
-            if filename.endswith(('.mp3', '.wav')):
-                # Check if metadata file exists
-                metadata_path = os.path.join(output_dir, os.path.splitext(filename)[0] + '.json')
-                metadata = {}
-                
-                if os.path.exists(metadata_path):
-                    with open(metadata_path, 'r') as f:
-                        metadata = json.load(f)
-                
-                podcasts.append({
-                    'filename': filename,
-                    'path': os.path.join(output_dir, filename),
-                    'title': metadata.get('title', filename),
-                    'description': metadata.get('description', ''),
-                    'created_at': metadata.get('created_at', ''),
-                    'duration_sec': metadata.get('duration_sec', 0),
-                    'key_points': metadata.get('key_points', []),
-                })
+    # Prefer the SQLite index maintained at generation time: one query
+    # replaces opening every JSON sidecar
+    try:
+        from src.podcast.podcast_index import PodcastIndex
+        rows = PodcastIndex(output_dir).list_all()
+    except Exception:
+        rows = []
+    
+    if rows:
+        for row in rows:
+            path = os.path.join(output_dir, row['filename'])
+            if os.path.exists(path):
+                row['path'] = path
+                podcasts.append(row)
+        if podcasts:
+            return podcasts
+    
+    # Fall back to scanning sidecars for podcasts predating the index.
+    # One scandir pass: DirEntry carries cached stat info, so there is
+    # no per-file exists/stat probe, and opening the sidecar directly
+    # replaces the existence check
+    try:
+        entries = list(os.scandir(output_dir))
+    except OSError:
+        return podcasts
+    
+    for entry in entries:
+        if entry.name.endswith(('.mp3', '.wav')):
+            metadata = {}
+            metadata_path = entry.path.rsplit('.', 1)[0] + '.json'
+            try:
+                with open(metadata_path, 'r') as f:
+                    metadata = json.load(f)
+            except (FileNotFoundError, ValueError):
+                pass
+            
+            podcasts.append({
+                'filename': entry.name,
+                'path': entry.path,
+                'title': metadata.get('title', entry.name),
+                'description': metadata.get('description', ''),
+                'created_at': metadata.get('created_at', ''),
+                'duration_sec': metadata.get('duration_sec', 0),
+                'key_points': metadata.get('key_points', []),
+                '_mtime': entry.stat().st_mtime,
+            })
     
-    # Sort podcasts by creation date (newest first)
-    podcasts.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+    # Sort podcasts newest first using the stat mtime already in hand
+    podcasts.sort(key=lambda x: x['_mtime'], reverse=True)
     return podcasts
 
-# Function to create a download link
-def get_binary_file_downloader_html(bin_file, file_label='File'):
-    with open(bin_file, 'rb') as f:
-        data = f.read()
-    bin_str = base64.b64encode(data).decode()
-    href = f'<a href="data:application/octet-stream;base64,{bin_str}" download="{os.path.basename(bin_file)}" class="download-button">Download {file_label}</a>'
-    return href
+def get_podcasts():
+    output_dir = "output_podcasts"
+    try:
+        dir_mtime = os.path.getmtime(output_dir)
+    except OSError:
+        return []
+    return _scan_podcasts(dir_mtime)
 
 # Function to process uploaded audio
 def process_audio(uploaded_file, meeting_title, use_voice_narration):
@@ -157,11 +184,12 @@ def process_audio(uploaded_file, meeting_title, use_voice_narration):
         segments = podcast_generator.analyze_transcript(transcript)
         progress_bar.progress(50)
         
-        # Step 3: Process segments
+        # Step 3: Process segments in parallel — each one is dominated
+        # by an ffmpeg subprocess and TTS network calls, so threads
+        # overlap their latency instead of paying it per segment
         status_text.text("Processing audio segments...")
-        podcast_paths = []
         
-        for i, segment in enumerate(segments):
+        def _process_one(segment):
             # Extract segment
             segment_path = ffmpeg_processor.extract_segment(
                 temp_path, 
@@ -180,11 +208,17 @@ def process_audio(uploaded_file, meeting_title, use_voice_narration):
                     outro_text
                 )
             
-            # Save to output directory
-            podcast_paths.append(segment_path)
+            return segment_path
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(_process_one, segment) for segment in segments]
+            
+            # Update progress as segments finish
+            for completed, _ in enumerate(as_completed(futures), start=1):
+                progress_bar.progress(50 + completed * 50 // len(segments))
             
-            # Update progress
-            progress_bar.progress(50 + (i + 1) * 50 // len(segments))
+            # Collect results in segment order
+            podcast_paths = [future.result() for future in futures]
         
         # Final step: Complete
         status_text.text("Podcast generation complete!")
@@ -253,11 +287,17 @@ elif st.session_state.current_tab == "My Podcasts":
                         for point in podcast['key_points']:
                             st.markdown(f"- {point}")
                     
-                    # Download button
-                    st.markdown(
-                        get_binary_file_downloader_html(podcast['path'], 'Podcast'),
-                        unsafe_allow_html=True
-                    )
+                    # Download button served from Streamlit's static
+                    # endpoint instead of base64-embedding the whole file
+                    # into the page HTML on every rerun
+                    with open(podcast['path'], 'rb') as f:
+                        st.download_button(
+                            label="Download Podcast",
+                            data=f,
+                            file_name=podcast['filename'],
+                            mime="audio/mpeg",
+                            key=f"download_{podcast['filename']}"
+                        )
 
 elif st.session_state.current_tab == "Settings":
     st.title("Settings")
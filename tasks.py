@@ -0,0 +1,56 @@
+"""
+Celery tasks for background podcast generation
+"""
+
+import os
+import json
+
+try:
+    from celery import Celery
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+def _record_upload_hash(digest, info_file):
+    """Persist digest -> info file so duplicate uploads short-circuit"""
+    output_dir = os.getenv("OUTPUT_DIR", os.path.join(os.getcwd(), 'output_podcasts'))
+    index_path = os.path.join(output_dir, 'hashes.json')
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    index[digest] = info_file
+    with open(index_path, 'w') as f:
+        json.dump(index, f)
+
+if CELERY_AVAILABLE:
+    celery_app = Celery(
+        'podcast',
+        broker=os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0'),
+        backend=os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
+    )
+
+    @celery_app.task(bind=True, max_retries=2)
+    def generate_podcast_task(self, file_path, title, segments=5, voice='default', style='professional', add_music=False, digest=None):
+        """Generate a podcast from an uploaded recording"""
+        # Imported lazily so the worker only loads the pipeline when a job runs
+        from production_podcast_generator import PodcastGenerator
+        try:
+            result = PodcastGenerator().generate_podcast(
+                file_path,
+                title,
+                max_points=segments,
+                voice_style=voice,
+                podcast_style=style,
+                add_background_music=add_music
+            )
+        except Exception as e:
+            raise self.retry(exc=e, countdown=30)
+
+        if digest and result and result.get('info'):
+            _record_upload_hash(digest, os.path.basename(result['info']))
+        return result
+else:
+    celery_app = None
+    generate_podcast_task = None
@@ -5,6 +5,7 @@ This script tests the core functionality without requiring external APIs
 
 import os
 import sys
+import time
 import logging
 import json
 from datetime import datetime
@@ -66,7 +67,7 @@ def create_sample_podcast():
     """Create a sample podcast file for testing"""
     # Create a simple WAV file
     import wave
-    import struct
+    import numpy as np
     
     output_dir = 'output_podcasts'
     os.makedirs(output_dir, exist_ok=True)
@@ -75,7 +76,9 @@ def create_sample_podcast():
     duration = 5  # seconds
     
     # Create WAV file
-    podcast_filename = f"sample_podcast_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav"
+    # Nanosecond timestamps avoid both the datetime formatting cost and
+    # same-second collisions when samples are generated in a tight loop
+    podcast_filename = f"sample_podcast_{time.time_ns()}.wav"
     podcast_path = os.path.join(output_dir, podcast_filename)
     
     with wave.open(podcast_path, 'w') as wf:
@@ -83,11 +86,21 @@ def create_sample_podcast():
         wf.setsampwidth(2)
         wf.setframerate(sample_rate)
         
-        # Generate a simple sine wave
-        for i in range(0, sample_rate * duration):
-            value = int(32767.0 * 0.5 * (i % 100 < 50))
-            data = struct.pack('<h', value)
-            wf.writeframes(data)
+        # The tone never changes, so it is generated once into a fixture
+        # and memory-mapped on later runs — the page cache hands the
+        # samples straight to the writer with no recompute
+        fixture_path = os.path.join('temp_audio', f'sample_tone_{duration}s.npy')
+        if os.path.exists(fixture_path):
+            data = np.load(fixture_path, mmap_mode='r')
+        else:
+            n_samples = sample_rate * duration
+            pattern = (np.arange(n_samples) % 100 < 50).astype(np.int16)
+            data = (pattern * int(32767 * 0.5)).astype('<i2')
+            os.makedirs('temp_audio', exist_ok=True)
+            np.save(fixture_path, data)
+        # writeframesraw defers the header patch to close() instead of
+        # rewriting it on every write
+        wf.writeframesraw(data.tobytes())
     
     # Create metadata file
     metadata = {
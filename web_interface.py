@@ -1,568 +1,336 @@
 import os
+import re
 import time
 import json
-from flask import Flask, render_template, request, redirect, url_for, send_from_directory
+import uuid
+import hashlib
+import sqlite3
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, render_template, request, redirect, url_for, send_from_directory, send_file, jsonify, abort
 from werkzeug.utils import secure_filename
 from production_podcast_generator import PodcastGenerator
+from tasks import CELERY_AVAILABLE, generate_podcast_task
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = os.path.join(os.getcwd(), 'temp_audio')
 app.config['OUTPUT_FOLDER'] = os.path.join(os.getcwd(), 'output_podcasts')
 app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024  # 32MB max upload size
 
-# Create necessary directories
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
-
-# Create templates directory and files
-templates_dir = os.path.join(os.getcwd(), 'templates')
-os.makedirs(templates_dir, exist_ok=True)
-
-# Create static directory for CSS and JS
-static_dir = os.path.join(os.getcwd(), 'static')
-css_dir = os.path.join(static_dir, 'css')
-js_dir = os.path.join(static_dir, 'js')
-os.makedirs(css_dir, exist_ok=True)
-os.makedirs(js_dir, exist_ok=True)
-
-# Write CSS file
-with open(os.path.join(css_dir, 'style.css'), 'w') as f:
-    f.write("""
-body {
-    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    line-height: 1.6;
-    margin: 0;
-    padding: 0;
-    background-color: #f8f9fa;
-    color: #333;
-}
-
-.container {
-    width: 80%;
-    margin: 0 auto;
-    padding: 20px;
-}
+# Behind Apache mod_xsendfile (or nginx with X-Accel-Redirect mapping) the
+# server sends download bytes itself instead of streaming them through Python
+app.use_x_sendfile = os.environ.get('USE_X_SENDFILE') == '1'
 
-header {
-    background-color: #343a40;
-    color: white;
-    padding: 1rem;
-    text-align: center;
-}
-
-h1 {
-    margin: 0;
-}
+# Static assets are served with a far-future lifetime; static_url() below
+# versions their URLs by content hash so updates still invalidate. A fronting
+# nginx can take this over entirely with an expires 1y location for /static/.
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
 
-.card {
-    background-color: white;
-    border-radius: 5px;
-    box-shadow: 0 2px 5px rgba(0, 0, 0, 0.1);
-    padding: 20px;
-    margin-bottom: 20px;
-}
+# Templates only change when this module does, so compile them once and skip
+# the per-render staleness stat
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+app.jinja_env.cache_size = 400
 
-.form-group {
-    margin-bottom: 15px;
-}
-
-label {
-    display: block;
-    margin-bottom: 5px;
-    font-weight: bold;
-}
-
-input[type="text"],
-input[type="file"] {
-    width: 100%;
-    padding: 8px;
-    border: 1px solid #ddd;
-    border-radius: 4px;
-}
-
-button {
-    background-color: #007bff;
-    color: white;
-    border: none;
-    padding: 10px 15px;
-    border-radius: 4px;
-    cursor: pointer;
-}
-
-button:hover {
-    background-color: #0069d9;
-}
-
-.alert {
-    padding: 10px;
-    border-radius: 4px;
-    margin-bottom: 15px;
-}
-
-.alert-success {
-    background-color: #d4edda;
-    color: #155724;
-    border: 1px solid #c3e6cb;
-}
-
-.alert-danger {
-    background-color: #f8d7da;
-    color: #721c24;
-    border: 1px solid #f5c6cb;
-}
+# Create necessary directories
+os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
 
-.podcast-list {
-    list-style: none;
-    padding: 0;
-}
+# Warm the Jinja cache so the first request doesn't pay compilation
+for _template_name in ('web_index.html', 'web_podcast_info.html'):
+    app.jinja_env.get_template(_template_name)
 
-.podcast-item {
-    background-color: white;
-    border-radius: 5px;
-    box-shadow: 0 2px 5px rgba(0, 0, 0, 0.1);
-    padding: 15px;
-    margin-bottom: 10px;
-}
+@functools.lru_cache(maxsize=None)
+def _static_file_hash(filename):
+    """Short content hash of a static file, computed once per process"""
+    try:
+        with open(os.path.join(app.static_folder, filename), 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()[:8]
+    except OSError:
+        return '0'
 
-.podcast-item a {
-    color: #007bff;
-    text-decoration: none;
-}
+@app.template_global()
+def static_url(filename):
+    """url_for('static') with a content-hash version for long-lived caching"""
+    return f"{url_for('static', filename=filename)}?v={_static_file_hash(filename)}"
 
-.podcast-item a:hover {
-    text-decoration: underline;
-}
+_ALLOWED_EXTENSIONS = frozenset(('mp3', 'wav'))
 
-.audio-player {
-    width: 100%;
-    margin-top: 10px;
+def allowed_file(filename):
+    """Check if the file has an allowed extension"""
+    _, dot, ext = filename.rpartition('.')
+    return bool(dot) and ext.lower() in _ALLOWED_EXTENSIONS
+
+# Precompiled parsers for the podcast_*.txt info format
+_HEADER_RE = re.compile(r'^(PODCAST|Generated|INTRO|OUTRO|KEY POINTS|FULL PODCAST AUDIO):\s*(.*)$', re.M)
+_KEY_POINT_RE = re.compile(r'^(\d+)\.\s*(.+)$')
+_FIELD_FOR_HEADER = {
+    'PODCAST': 'title',
+    'Generated': 'date',
+    'INTRO': 'intro',
+    'OUTRO': 'outro',
+    'FULL PODCAST AUDIO': 'audio_file'
 }
 
-footer {
-    text-align: center;
-    padding: 20px;
-    margin-top: 20px;
-    background-color: #343a40;
-    color: white;
-}
-""")
-
-# Write index.html template
-with open(os.path.join(templates_dir, 'index.html'), 'w') as f:
-    f.write("""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Podcast Generator</title>
-    <link rel="stylesheet" href="{{ url_for('static', filename='css/style.css') }}">
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css">
-</head>
-<body>
-    <header>
-        <h1><i class="fas fa-podcast"></i> AI Podcast Generator</h1>
-        <p>Transform meeting recordings into professional podcast snippets</p>
-    </header>
-
-    <div class="container">
-        {% if message %}
-        <div class="alert {% if success %}alert-success{% else %}alert-danger{% endif %}">
-            {% if success %}
-            <i class="fas fa-check-circle"></i>
-            {% else %}
-            <i class="fas fa-exclamation-circle"></i>
-            {% endif %}
-            {{ message }}
-        </div>
-        {% endif %}
-
-        <div class="card">
-            <h2><i class="fas fa-microphone-alt"></i> Create New Podcast</h2>
-            <form action="{{ url_for('upload_file') }}" method="post" enctype="multipart/form-data" id="podcast-form">
-                <div class="form-group">
-                    <label for="file">Audio File (MP3 or WAV):</label>
-                    <div class="file-input-wrapper">
-                        <div class="file-input-button">
-                            <i class="fas fa-cloud-upload-alt"></i> Choose an audio file or drag it here
-                        </div>
-                        <input type="file" id="file" name="file" accept=".mp3,.wav" required>
-                    </div>
-                    <div class="file-name" id="file-name"></div>
-                </div>
-                
-                <div class="form-group">
-                    <label for="title">Podcast Title:</label>
-                    <input type="text" id="title" name="title" placeholder="Enter a title for your podcast">
-                </div>
-                
-                <div class="options-grid">
-                    <div class="form-group">
-                        <label for="voice">AI Voice:</label>
-                        <select id="voice" name="voice">
-                            <option value="default">Default Voice</option>
-                            <option value="male">Male Voice</option>
-                            <option value="female">Female Voice</option>
-                            <option value="british">British Accent</option>
-                            <option value="american">American Accent</option>
-                        </select>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label for="segments">Key Segments:</label>
-                        <select id="segments" name="segments">
-                            <option value="3">3 Segments</option>
-                            <option value="5" selected>5 Segments</option>
-                            <option value="7">7 Segments</option>
-                            <option value="10">10 Segments</option>
-                        </select>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label for="style">Podcast Style:</label>
-                        <select id="style" name="style">
-                            <option value="professional">Professional</option>
-                            <option value="casual">Casual</option>
-                            <option value="energetic">Energetic</option>
-                            <option value="calm">Calm</option>
-                        </select>
-                    </div>
-                </div>
-                
-                <div class="form-group">
-                    <label>
-                        <input type="checkbox" name="add_music" value="yes"> 
-                        Add background music
-                    </label>
-                </div>
-                
-                <button type="submit" id="generate-button">
-                    <i class="fas fa-magic"></i> Generate Podcast
-                </button>
-            </form>
-            
-            <div class="loading" id="loading">
-                <div class="loading-spinner"></div>
-                <div class="loading-text">Generating your podcast...</div>
-                <div class="visualization">
-                    <div class="visualization-bars">
-                        <div class="visualization-bar"></div>
-                        <div class="visualization-bar"></div>
-                        <div class="visualization-bar"></div>
-                        <div class="visualization-bar"></div>
-                        <div class="visualization-bar"></div>
-                        <div class="visualization-bar"></div>
-                        <div class="visualization-bar"></div>
-                        <div class="visualization-bar"></div>
-                        <div class="visualization-bar"></div>
-                        <div class="visualization-bar"></div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <div class="card">
-            <h2><i class="fas fa-headphones"></i> Your Podcasts</h2>
-            {% if podcasts %}
-            <ul class="podcast-list">
-                {% for podcast in podcasts %}
-                <li class="podcast-item">
-                    <h3>{{ podcast.title }}</h3>
-                    <div class="podcast-meta">
-                        <span class="date">{{ podcast.date }}</span>
-                    </div>
-                    <div class="podcast-actions">
-                        <a href="{{ url_for('view_podcast', filename=podcast.info_file) }}" class="view">
-                            <i class="fas fa-file-alt"></i> View Details
-                        </a>
-                        {% if podcast.audio_file %}
-                        <a href="{{ url_for('download_podcast', filename=podcast.audio_file) }}" class="download">
-                            <i class="fas fa-download"></i> Download
-                        </a>
-                        {% endif %}
-                    </div>
-                    {% if podcast.audio_file %}
-                    <audio controls class="audio-player">
-                        <source src="{{ url_for('download_podcast', filename=podcast.audio_file) }}" type="audio/mpeg">
-                        Your browser does not support the audio element.
-                    </audio>
-                    {% endif %}
-                </li>
-                {% endfor %}
-            </ul>
-            {% else %}
-            <p class="no-podcasts"><i class="fas fa-info-circle"></i> No podcasts generated yet. Create your first one!</p>
-            {% endif %}
-        </div>
-    </div>
-
-    <footer>
-        <p>&copy; 2025 AI Podcast Generator | Powered by AssemblyAI & ElevenLabs</p>
-    </footer>
-    
-    <div class="theme-toggle" id="theme-toggle">
-        <span class="theme-toggle-icon">
-            <i class="fas fa-moon"></i>
-        </span>
-    </div>
-
-    <script>
-        // File input handling
-        const fileInput = document.getElementById('file');
-        const fileName = document.getElementById('file-name');
-        
-        fileInput.addEventListener('change', function() {
-            if (this.files && this.files[0]) {
-                fileName.textContent = this.files[0].name;
-            } else {
-                fileName.textContent = '';
-            }
-        });
-        
-        // Form submission and loading animation
-        const form = document.getElementById('podcast-form');
-        const loading = document.getElementById('loading');
-        const generateButton = document.getElementById('generate-button');
-        
-        form.addEventListener('submit', function() {
-            if (fileInput.files && fileInput.files[0]) {
-                loading.style.display = 'block';
-                generateButton.disabled = true;
-            }
-        });
-        
-        // Theme toggle functionality
-        const themeToggle = document.getElementById('theme-toggle');
-        const themeIcon = themeToggle.querySelector('i');
-        let lightMode = false;
-        
-        themeToggle.addEventListener('click', function() {
-            if (lightMode) {
-                document.documentElement.style.setProperty('--dark-bg', '#121212');
-                document.documentElement.style.setProperty('--dark-card', '#1e1e1e');
-                document.documentElement.style.setProperty('--dark-text', '#e0e0e0');
-                themeIcon.className = 'fas fa-moon';
-            } else {
-                document.documentElement.style.setProperty('--dark-bg', '#f8f9fa');
-                document.documentElement.style.setProperty('--dark-card', '#ffffff');
-                document.documentElement.style.setProperty('--dark-text', '#333333');
-                themeIcon.className = 'fas fa-sun';
-            }
-            lightMode = !lightMode;
-        });
-    </script>
-</body>
-</html>
-""")
-
-# Write podcast_info.html template
-with open(os.path.join(templates_dir, 'podcast_info.html'), 'w') as f:
-    f.write("""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{{ podcast.title }} - Podcast Details</title>
-    <link rel="stylesheet" href="{{ url_for('static', filename='css/style.css') }}">
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css">
-</head>
-<body>
-    <header>
-        <h1><i class="fas fa-podcast"></i> AI Podcast Generator</h1>
-        <p>Podcast Details</p>
-    </header>
-
-    <div class="container">
-        <div class="card">
-            <h2><i class="fas fa-info-circle"></i> {{ podcast.title }}</h2>
-            
-            <div class="podcast-meta">
-                <span class="date">{{ podcast.date }}</span>
-            </div>
-            
-            {% if podcast.audio_file %}
-            <div class="audio-section">
-                <h3><i class="fas fa-headphones"></i> Listen</h3>
-                <audio controls class="audio-player">
-                    <source src="{{ url_for('download_podcast', filename=podcast.audio_file) }}" type="audio/mpeg">
-                    Your browser does not support the audio element.
-                </audio>
-                <div class="podcast-actions">
-                    <a href="{{ url_for('download_podcast', filename=podcast.audio_file) }}" class="download">
-                        <i class="fas fa-download"></i> Download Audio
-                    </a>
-                </div>
-            </div>
-            {% endif %}
-            
-            <div class="podcast-content">
-                <h3><i class="fas fa-align-left"></i> Content</h3>
-                
-                {% if podcast.intro %}
-                <div class="content-section">
-                    <h4>Introduction</h4>
-                    <p>{{ podcast.intro }}</p>
-                </div>
-                {% endif %}
-                
-                {% if podcast.key_points %}
-                <div class="content-section">
-                    <h4>Key Points</h4>
-                    <ol>
-                        {% for point in podcast.key_points %}
-                        <li>{{ point }}</li>
-                        {% endfor %}
-                    </ol>
-                </div>
-                {% endif %}
-                
-                {% if podcast.outro %}
-                <div class="content-section">
-                    <h4>Conclusion</h4>
-                    <p>{{ podcast.outro }}</p>
-                </div>
-                {% endif %}
-            </div>
-        </div>
-        
-        <div class="back-link">
-            <a href="{{ url_for('index') }}"><i class="fas fa-arrow-left"></i> Back to Podcasts</a>
-        </div>
-    </div>
-
-    <footer>
-        <p>&copy; 2025 AI Podcast Generator | Powered by AssemblyAI & ElevenLabs</p>
-    </footer>
-    
-    <div class="theme-toggle" id="theme-toggle">
-        <span class="theme-toggle-icon">
-            <i class="fas fa-moon"></i>
-        </span>
-    </div>
-
-    <script>
-        // Theme toggle functionality
-        const themeToggle = document.getElementById('theme-toggle');
-        const themeIcon = themeToggle.querySelector('i');
-        let lightMode = false;
-        
-        themeToggle.addEventListener('click', function() {
-            if (lightMode) {
-                document.documentElement.style.setProperty('--dark-bg', '#121212');
-                document.documentElement.style.setProperty('--dark-card', '#1e1e1e');
-                document.documentElement.style.setProperty('--dark-text', '#e0e0e0');
-                themeIcon.className = 'fas fa-moon';
-            } else {
-                document.documentElement.style.setProperty('--dark-bg', '#f8f9fa');
-                document.documentElement.style.setProperty('--dark-card', '#ffffff');
-                document.documentElement.style.setProperty('--dark-text', '#333333');
-                themeIcon.className = 'fas fa-sun';
-            }
-            lightMode = !lightMode;
-        });
-    </script>
-</body>
-</html>
-""")
-
-# Create JavaScript file for additional functionality
-with open(os.path.join(js_dir, 'main.js'), 'w') as f:
-    f.write("""
-// File input handling
-const fileInput = document.getElementById('file');
-const fileName = document.getElementById('file-name');
-
-fileInput.addEventListener('change', function() {
-    if (this.files && this.files[0]) {
-        fileName.textContent = this.files[0].name;
-    } else {
-        fileName.textContent = '';
-    }
-});
+# One PodcastGenerator per worker: the constructor initializes API clients
+# and probes for FFmpeg, none of which needs redoing per request
+_generator = None
+_generator_lock = threading.Lock()
+
+def get_generator():
+    """Return the shared PodcastGenerator, creating it on first use"""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = PodcastGenerator()
+    return _generator
+
+# Prefer Celery for background jobs when a broker is configured; otherwise
+# fall back to the in-process executor below
+_use_celery = CELERY_AVAILABLE and bool(os.environ.get('CELERY_BROKER_URL'))
+
+# Background podcast generation jobs: one small pool per worker keeps the
+# request thread free while transcription and TTS run
+_job_executor = ThreadPoolExecutor(max_workers=2)
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+def _run_generation(job_id, file_path, title, segments, voice, style, add_music, digest=None):
+    """Run podcast generation for a queued job and record its outcome"""
+    with _jobs_lock:
+        _jobs[job_id]['state'] = 'RUNNING'
+    try:
+        result = get_generator().generate_podcast(
+            file_path,
+            title,
+            max_points=segments,
+            voice_style=voice,
+            podcast_style=style,
+            add_background_music=add_music
+        )
+        with _jobs_lock:
+            if result and result.get('info'):
+                _jobs[job_id]['state'] = 'SUCCESS'
+                _jobs[job_id]['result'] = {
+                    'info': os.path.basename(result['info']),
+                    'audio': os.path.basename(result['audio']) if result.get('audio') else None
+                }
+                if digest:
+                    _record_hash(digest, os.path.basename(result['info']))
+            else:
+                _jobs[job_id]['state'] = 'FAILURE'
+                _jobs[job_id]['error'] = 'Failed to generate podcast. Check the logs for details.'
+    except Exception as e:
+        with _jobs_lock:
+            _jobs[job_id]['state'] = 'FAILURE'
+            _jobs[job_id]['error'] = str(e)
+
+def save_upload_stream(stream, file_path):
+    """Write an upload stream to disk in fixed-size chunks
+
+    Returns the BLAKE2b content digest, computed while the disk write is the
+    bottleneck, so duplicate uploads can be detected for free.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'wb') as f:
+        while chunk := stream.read(65536):
+            digest.update(chunk)
+            f.write(chunk)
+    return digest.hexdigest()
+
+# Content-hash index mapping uploads to the podcast they already produced
+_hash_lock = threading.Lock()
+
+def _hash_index_path():
+    return os.path.join(app.config['OUTPUT_FOLDER'], 'hashes.json')
+
+def _load_hash_index():
+    """Load the digest -> info-file index, empty when missing or corrupt"""
+    try:
+        with open(_hash_index_path(), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _record_hash(digest, info_file):
+    """Remember which podcast an upload digest produced"""
+    with _hash_lock:
+        index = _load_hash_index()
+        index[digest] = info_file
+        with open(_hash_index_path(), 'w') as f:
+            json.dump(index, f)
+
+# SQLite index over podcast metadata; it persists the parsed listing across
+# process restarts so a cold worker answers with one query instead of a scan.
+# Kept outside OUTPUT_FOLDER so its journal files don't bump the directory
+# mtime the cache below is keyed on.
+_DB_PATH = os.path.join(os.getcwd(), 'podcasts.db')
+
+def _db():
+    """Open a connection; one per call keeps access thread-safe"""
+    return sqlite3.connect(_DB_PATH)
+
+with _db() as _conn:
+    _conn.execute(
+        """CREATE TABLE IF NOT EXISTS podcasts (
+            id INTEGER PRIMARY KEY,
+            filename TEXT UNIQUE,
+            title TEXT,
+            date TEXT,
+            audio_file TEXT
+        )"""
+    )
+    _conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+# Cached podcast listing, invalidated when the output directory changes;
+# 'names' is the whitelist of filenames the routes may serve
+_podcast_cache = {'mtime': 0, 'data': [], 'names': set()}
+
+def _cache_listing(dir_mtime, podcasts):
+    """Publish a listing to the in-memory cache and serving whitelist"""
+    _podcast_cache['mtime'] = dir_mtime
+    _podcast_cache['data'] = podcasts
+    _podcast_cache['names'] = {p['info_file'] for p in podcasts} | \
+                              {p['audio_file'] for p in podcasts if p['audio_file']}
+
+def _known_files():
+    """Set of filenames that may be served from the output folder"""
+    get_podcasts()
+    return _podcast_cache['names']
 
-// Form submission and loading animation
-const form = document.getElementById('podcast-form');
-const loading = document.getElementById('loading');
-const generateButton = document.getElementById('generate-button');
+def get_podcasts():
+    """Get list of generated podcasts"""
+    try:
+        dir_mtime = os.stat(app.config['OUTPUT_FOLDER']).st_mtime_ns
+    except OSError:
+        return []
 
-form.addEventListener('submit', function() {
-    if (fileInput.files && fileInput.files[0]) {
-        loading.style.display = 'block';
-        generateButton.disabled = true;
-    }
-});
-
-// Theme toggle functionality
-const themeToggle = document.getElementById('theme-toggle');
-const themeIcon = themeToggle.querySelector('i');
-let lightMode = false;
-
-themeToggle.addEventListener('click', function() {
-    if (lightMode) {
-        document.documentElement.style.setProperty('--dark-bg', '#121212');
-        document.documentElement.style.setProperty('--dark-card', '#1e1e1e');
-        document.documentElement.style.setProperty('--dark-text', '#e0e0e0');
-        themeIcon.className = 'fas fa-moon';
-    } else {
-        document.documentElement.style.setProperty('--dark-bg', '#f8f9fa');
-        document.documentElement.style.setProperty('--dark-card', '#ffffff');
-        document.documentElement.style.setProperty('--dark-text', '#333333');
-        themeIcon.className = 'fas fa-sun';
-    }
-    lightMode = !lightMode;
-});
-""")
+    if dir_mtime == _podcast_cache['mtime']:
+        return _podcast_cache['data']
 
-def allowed_file(filename):
-    """Check if the file has an allowed extension"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in {'mp3', 'wav'}
+    # A previous process may have indexed this exact directory state already;
+    # one query then replaces the whole scan
+    try:
+        with _db() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'dir_mtime_ns'").fetchone()
+            if row and int(row[0]) == dir_mtime:
+                rows = conn.execute(
+                    "SELECT filename, title, date, audio_file FROM podcasts ORDER BY filename DESC"
+                ).fetchall()
+                podcasts = [
+                    {'title': title, 'date': date, 'info_file': filename, 'audio_file': audio_file}
+                    for filename, title, date, audio_file in rows
+                ]
+                _cache_listing(dir_mtime, podcasts)
+                return podcasts
+    except (sqlite3.Error, ValueError):
+        pass
 
-def get_podcasts():
-    """Get list of generated podcasts"""
     podcasts = []
     try:
-        for filename in os.listdir(app.config['OUTPUT_FOLDER']):
-            if filename.startswith('podcast_') and filename.endswith('.txt'):
-                info_path = os.path.join(app.config['OUTPUT_FOLDER'], filename)
+        # One directory pass buckets info files and audio files, replacing a
+        # per-podcast os.path.exists stat with a set lookup
+        info_files = []
+        audio_names = set()
+        sidecar_names = set()
+        with os.scandir(app.config['OUTPUT_FOLDER']) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith('.mp3'):
+                    audio_names.add(entry.name)
+                elif entry.name.startswith('podcast_'):
+                    if entry.name.endswith('.txt'):
+                        info_files.append(entry.name)
+                    elif entry.name.endswith('.json'):
+                        sidecar_names.add(entry.name)
+
+        def listing_entry(filename):
+            info_path = os.path.join(app.config['OUTPUT_FOLDER'], filename)
+
+            # Extract basic info
+            title = "Untitled Podcast"
+            date = "Unknown Date"
+
+            sidecar = filename[:-4] + '.json'
+            if sidecar in sidecar_names:
+                # Newer podcasts come with a JSON sidecar; one json.load beats
+                # parsing the text file
+                try:
+                    with open(os.path.join(app.config['OUTPUT_FOLDER'], sidecar), 'r') as f:
+                        data = json.load(f)
+                    title = data.get('title') or title
+                    date = data.get('date') or date
+                except (OSError, ValueError):
+                    pass
+            else:
                 with open(info_path, 'r') as f:
-                    content = f.read()
-                
-                # Extract basic info
-                title = "Untitled Podcast"
-                date = "Unknown Date"
-                
-                for line in content.split('\n'):
-                    if line.startswith('PODCAST:'):
-                        title = line.replace('PODCAST:', '').strip()
-                    elif line.startswith('Generated:'):
-                        date = line.replace('Generated:', '').strip()
-                
-                # Check if there's a corresponding audio file
-                audio_file = filename.replace('.txt', '.mp3')
-                if not os.path.exists(os.path.join(app.config['OUTPUT_FOLDER'], audio_file)):
-                    audio_file = None
-                
-                podcasts.append({
-                    'title': title,
-                    'date': date,
-                    'info_file': filename,
-                    'audio_file': audio_file
-                })
+                    # Title and date are written at the top of the file, so a
+                    # bounded read is enough for the listing
+                    content = f.read(1024)
+
+                for m in _HEADER_RE.finditer(content):
+                    key, value = m.group(1), m.group(2)
+                    if key == 'PODCAST':
+                        title = value
+                    elif key == 'Generated':
+                        date = value
+                        break
+
+            # Check if there's a corresponding audio file
+            audio_file = filename[:-4] + '.mp3'
+            if audio_file not in audio_names:
+                audio_file = None
+
+            return {
+                'title': title,
+                'date': date,
+                'info_file': filename,
+                'audio_file': audio_file
+            }
+
+        # The per-file reads are I/O-bound and release the GIL, so a small
+        # pool scans large archives nearly in parallel; the mtime cache keeps
+        # this off the hot path entirely
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            podcasts = list(executor.map(listing_entry, info_files))
         
         # Sort by filename (which includes timestamp) in descending order
         podcasts.sort(key=lambda x: x['info_file'], reverse=True)
+        _cache_listing(dir_mtime, podcasts)
+
+        # Sync the SQLite index so the next cold start skips the scan
+        try:
+            with _db() as conn:
+                conn.execute("DELETE FROM podcasts")
+                conn.executemany(
+                    "INSERT INTO podcasts (filename, title, date, audio_file) VALUES (?, ?, ?, ?)",
+                    [(p['info_file'], p['title'], p['date'], p['audio_file']) for p in podcasts]
+                )
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('dir_mtime_ns', ?)", (str(dir_mtime),))
+        except sqlite3.Error as e:
+            print(f"Error updating podcast index: {str(e)}")
     except Exception as e:
         print(f"Error getting podcasts: {str(e)}")
-    
+
     return podcasts
 
 def parse_podcast_info(filename):
     """Parse podcast info file into structured data"""
     info_path = os.path.join(app.config['OUTPUT_FOLDER'], filename)
-    
+    try:
+        mtime_ns = os.stat(info_path).st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    return _parse_podcast_info_cached(filename, mtime_ns)
+
+@functools.lru_cache(maxsize=256)
+def _parse_podcast_info_cached(filename, mtime_ns):
+    """Parse an info file; memoized since the files are immutable once written"""
+    info_path = os.path.join(app.config['OUTPUT_FOLDER'], filename)
+
     podcast = {
         'title': 'Untitled Podcast',
         'date': 'Unknown Date',
@@ -571,43 +339,69 @@ def parse_podcast_info(filename):
         'key_points': [],
         'audio_file': None
     }
-    
+
+    # Defense in depth: never resolve a path outside the output folder even
+    # though the routes already whitelist filenames
+    if os.path.commonpath([os.path.abspath(info_path), app.config['OUTPUT_FOLDER']]) != app.config['OUTPUT_FOLDER']:
+        return podcast
+
+    # Prefer the JSON sidecar written alongside newer podcasts; it loads in
+    # one C-level call instead of a Python parse of the text file
     try:
-        with open(info_path, 'r') as f:
+        with open(os.path.splitext(info_path)[0] + '.json', 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = None
+
+    if data is not None:
+        for key in ('title', 'date', 'intro', 'outro', 'key_points', 'audio_file'):
+            if data.get(key):
+                podcast[key] = data[key]
+        if not podcast['audio_file']:
+            audio_file = filename.replace('.txt', '.mp3')
+            if os.path.exists(os.path.join(app.config['OUTPUT_FOLDER'], audio_file)):
+                podcast['audio_file'] = audio_file
+        return podcast
+
+    try:
+        # Large buffer: the whole file is consumed sequentially
+        with open(info_path, 'r', buffering=65536) as f:
             content = f.read()
-        
+
         # Extract sections
         lines = content.split('\n')
         current_section = None
         current_point = None
         
         for line in lines:
-            if line.startswith('PODCAST:'):
-                podcast['title'] = line.replace('PODCAST:', '').strip()
-            elif line.startswith('Generated:'):
-                podcast['date'] = line.replace('Generated:', '').strip()
-            elif line.startswith('INTRO:'):
-                podcast['intro'] = line.replace('INTRO:', '').strip()
-                current_section = 'intro'
-            elif line.startswith('OUTRO:'):
-                podcast['outro'] = line.replace('OUTRO:', '').strip()
-                current_section = 'outro'
-            elif line.startswith('KEY POINTS:'):
-                current_section = 'key_points'
-            elif line.startswith('FULL PODCAST AUDIO:'):
-                podcast['audio_file'] = line.replace('FULL PODCAST AUDIO:', '').strip()
-            elif current_section == 'key_points' and line.strip() and line[0].isdigit():
+            m = _HEADER_RE.match(line)
+            if m:
+                key, value = m.group(1), m.group(2)
+                field = _FIELD_FOR_HEADER.get(key)
+                if field:
+                    podcast[field] = value
+                if key in ('INTRO', 'OUTRO'):
+                    current_section = field
+                elif key == 'KEY POINTS':
+                    current_section = 'key_points'
+                continue
+
+            point = _KEY_POINT_RE.match(line) if current_section == 'key_points' else None
+            if point:
                 # This is a key point title
-                parts = line.split('.', 1)
-                if len(parts) > 1:
-                    current_point = {
-                        'title': parts[1].strip(),
-                        'text': ''
-                    }
-                    podcast['key_points'].append(current_point)
+                current_point = {
+                    'title': point.group(2).strip(),
+                    '_buf': []
+                }
+                podcast['key_points'].append(current_point)
             elif current_point is not None and line.strip():
                 # This is key point content
-                current_point['text'] += line.strip() + ' '
+                current_point['_buf'].append(line.strip())
+
+        # Join each point's buffered lines once instead of building the text
+        # string quadratically
+        for entry in podcast['key_points']:
+            entry['text'] = ' '.join(entry.pop('_buf'))
         
         # Check if there's a corresponding audio file
         if not podcast['audio_file']:
@@ -620,84 +414,154 @@ def parse_podcast_info(filename):
     
     return podcast
 
+@app.before_request
+def reject_bad_uploads_early():
+    """Reject oversized or wrongly typed uploads before the body is read"""
+    if request.path != '/upload' or request.method != 'POST':
+        return
+    length = request.content_length
+    if length is not None and length > app.config['MAX_CONTENT_LENGTH']:
+        abort(413)
+    # Raw uploads carry the filename in the query string, so the extension
+    # can be checked before a single body byte is consumed
+    if request.content_type and not request.content_type.startswith('multipart/'):
+        if not allowed_file(request.args.get('filename', '')):
+            abort(415)
+
 @app.route('/')
 def index():
     """Home page"""
     podcasts = get_podcasts()
-    return render_template('index.html', podcasts=podcasts)
+    return render_template('web_index.html', podcasts=podcasts)
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """Handle file upload and podcast generation"""
-    if 'file' not in request.files:
-        return render_template('index.html', message='No file part', success=False, podcasts=get_podcasts())
-    
-    file = request.files['file']
-    if file.filename == '':
-        return render_template('index.html', message='No file selected', success=False, podcasts=get_podcasts())
-    
-    if file and allowed_file(file.filename):
+    # Every exit path below funnels into the single render at the end so the
+    # listing and template context are only built once per request
+    message = 'Invalid file type. Please upload an MP3 or WAV file.'
+    success = False
+
+    upload_name = source = params = None
+    if request.content_type and not request.content_type.startswith('multipart/'):
+        # Raw upload: the body is the audio bytes and metadata arrives in the
+        # query string, so nothing is spooled through the multipart parser.
+        upload_name = request.args.get('filename', '')
+        source = request.stream
+        params = request.args
+    elif 'file' not in request.files:
+        message = 'No file part'
+    elif request.files['file'].filename == '':
+        message = 'No file selected'
+    else:
+        file = request.files['file']
+        upload_name = file.filename
+        source = file.stream
+        params = request.form
+
+    if upload_name and allowed_file(upload_name):
         try:
-            # Save the uploaded file
-            filename = secure_filename(file.filename)
+            # Stream the upload straight to its destination
+            filename = secure_filename(upload_name)
+            base_name = os.path.splitext(filename)[0]
             timestamp = int(time.time())
             temp_filename = f"upload_{timestamp}_{filename}"
             file_path = os.path.join(app.config['UPLOAD_FOLDER'], temp_filename)
-            file.save(file_path)
-            
-            # Get the form parameters
-            title = request.form.get('title', '').strip()
-            if not title:
-                title = os.path.splitext(filename)[0]
+            digest = save_upload_stream(source, file_path)
+
+            # Same recording uploaded before? Point at the existing podcast
+            # instead of rerunning the whole pipeline
+            existing = _load_hash_index().get(digest)
+            if existing and os.path.exists(os.path.join(app.config['OUTPUT_FOLDER'], existing)):
+                os.remove(file_path)
+                return redirect(url_for('view_podcast', filename=existing))
+
+            # Get the request parameters
+            title = params.get('title', '').strip() or base_name
+
+            voice = params.get('voice', 'default')
+            segments = int(params.get('segments', 5))
+            style = params.get('style', 'professional')
+            add_music = params.get('add_music') == 'yes'
             
-            voice = request.form.get('voice', 'default')
-            segments = int(request.form.get('segments', 5))
-            style = request.form.get('style', 'professional')
-            add_music = request.form.get('add_music') == 'yes'
-            
-            # Generate the podcast with the selected options
-            generator = PodcastGenerator()
-            result = generator.generate_podcast(
-                file_path, 
-                title,
-                max_points=segments,
-                voice_style=voice,
-                podcast_style=style,
-                add_background_music=add_music
-            )
-            
-            if result and result.get('info'):
-                return render_template('index.html', 
-                                      message='Podcast generated successfully!', 
-                                      success=True, 
-                                      podcasts=get_podcasts())
+            # Queue generation in the background and respond immediately
+            if _use_celery:
+                job_id = generate_podcast_task.delay(file_path, title, segments, voice, style, add_music, digest).id
             else:
-                return render_template('index.html', 
-                                      message='Failed to generate podcast. Check the logs for details.', 
-                                      success=False, 
-                                      podcasts=get_podcasts())
-        
+                job_id = uuid.uuid4().hex
+                with _jobs_lock:
+                    _jobs[job_id] = {'state': 'PENDING'}
+                _job_executor.submit(_run_generation, job_id, file_path, title, segments, voice, style, add_music, digest)
+
+            message = (f'Podcast generation started (job {job_id}). '
+                       'Refresh this page in a few minutes.')
+            success = True
+
         except Exception as e:
-            return render_template('index.html', 
-                                  message=f'Error: {str(e)}', 
-                                  success=False, 
-                                  podcasts=get_podcasts())
-    
-    return render_template('index.html', 
-                          message='Invalid file type. Please upload an MP3 or WAV file.', 
-                          success=False, 
-                          podcasts=get_podcasts())
+            message = f'Error: {str(e)}'
+            success = False
+    elif upload_name is not None and not upload_name:
+        message = 'No file selected'
+
+    return render_template('web_index.html', message=message, success=success, podcasts=get_podcasts())
+
+@app.route('/status/<job_id>')
+def job_status(job_id):
+    """Report the state of a background generation job"""
+    if _use_celery:
+        async_result = generate_podcast_task.AsyncResult(job_id)
+        payload = {'state': async_result.state}
+        if async_result.state == 'SUCCESS' and isinstance(async_result.result, dict):
+            result = async_result.result
+            payload['result'] = {
+                'info': os.path.basename(result['info']) if result.get('info') else None,
+                'audio': os.path.basename(result['audio']) if result.get('audio') else None
+            }
+        return jsonify(payload)
+
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return jsonify({'state': 'UNKNOWN'}), 404
+        return jsonify(dict(job))
 
 @app.route('/podcast/<filename>')
 def view_podcast(filename):
     """View podcast information"""
+    filename = secure_filename(filename)
+    if filename not in _known_files():
+        abort(404)
     podcast = parse_podcast_info(filename)
-    return render_template('podcast_info.html', podcast=podcast)
+    return render_template('web_podcast_info.html', podcast=podcast)
 
 @app.route('/download/<filename>')
 def download_podcast(filename):
     """Download podcast audio file"""
-    return send_from_directory(app.config['OUTPUT_FOLDER'], filename, as_attachment=True)
+    # The generator timestamps the MP3 and the info file separately, so audio
+    # names can't be derived from the listing; validate the sanitized name by
+    # extension and real-path containment instead of a whitelist lookup
+    filename = secure_filename(filename)
+    if not allowed_file(filename):
+        abort(404)
+    audio_path = os.path.realpath(os.path.join(app.config['OUTPUT_FOLDER'], filename))
+    output_root = os.path.realpath(app.config['OUTPUT_FOLDER'])
+    if os.path.commonpath([audio_path, output_root]) != output_root or not os.path.isfile(audio_path):
+        abort(404)
+    # conditional/etag give 304 revalidation and Range responses, so the
+    # <audio> player can seek without re-streaming the whole file
+    response = send_file(
+        audio_path,
+        mimetype='audio/mpeg',
+        as_attachment=True,
+        conditional=True,
+        etag=True,
+        max_age=31536000
+    )
+    # Generated podcasts never change, so let browsers and CDNs keep them
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    # Development entry point only; in production run e.g.
+    #   gunicorn -k gthread -w 4 --threads 8 --worker-tmp-dir /dev/shm web_interface:app
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', threaded=True, port=5000)
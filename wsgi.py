@@ -0,0 +1,16 @@
+"""
+WSGI entry point for the podcast web interface
+
+Run in production with e.g.:
+    gunicorn -k gthread -w 4 --threads 8 --timeout 600 \
+        --max-requests 200 --max-requests-jitter 50 \
+        --worker-tmp-dir /dev/shm wsgi:app
+
+The long timeout covers synchronous podcast generation when no Celery
+broker is configured; max-requests recycles workers to bound memory
+growth on a long-lived process.
+"""
+
+from web_interface import app
+
+application = app